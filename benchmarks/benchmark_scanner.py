@@ -0,0 +1,245 @@
+"""Offline scanner benchmark against local TLS servers
+
+Starts the local TLS servers used by the tests (healthy, slow, dead and
+broken) and measures scan throughput, latency percentiles and memory of
+scan_domain() and bulk_scan_domains(). The scanner needs a configured
+NetBox, so run it from the NetBox directory:
+
+    cd /opt/netbox/netbox
+    python /path/to/netbox-ssl-certificates/benchmarks/benchmark_scanner.py --sizes 10,1000
+"""
+import argparse
+import json
+import os
+import platform
+import ssl
+import sys
+import time
+import tracemalloc
+from collections import Counter
+from datetime import datetime, timezone
+
+import django
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'netbox.settings')
+django.setup()
+
+from netbox_ssl_certificates.scanner import (  # noqa: E402
+    EndpointRateLimits, get_dns_cache, iter_scan_targets, scan_domain
+)
+from netbox_ssl_certificates.tests.servers import TestServers  # noqa: E402
+from netbox_ssl_certificates.utils import percentile  # noqa: E402
+
+
+def _summarize(elapsed, results, peak_memory=None):
+    latencies = sorted(r['latency'] for r in results if r['success'])
+    failures = Counter(r['error_class'] for r in results if not r['success'])
+    summary = {
+        'targets': len(results),
+        'succeeded': len(latencies),
+        'failed': dict(failures),
+        'elapsed': elapsed,
+        'throughput': len(results) / elapsed if elapsed else None,
+        'latency_p50': percentile(latencies, 50),
+        'latency_p95': percentile(latencies, 95),
+        'latency_p99': percentile(latencies, 99),
+    }
+    if peak_memory is not None:
+        summary['peak_memory'] = peak_memory
+    return summary
+
+
+def benchmark_scan_domain(targets, timeout=5):
+    """Scan targets one by one with the synchronous scan_domain()"""
+    started = time.monotonic()
+    results = [scan_domain(hostname, port, timeout) for hostname, port in targets]
+    return _summarize(time.monotonic() - started, results)
+
+
+def benchmark_bulk_scan(targets, concurrency=None, connect_timeout=None,
+                        handshake_timeout=None, rate_limited=False, measure_memory=True):
+    """Scan targets concurrently as bulk_scan_domains() does
+    
+    Rate limits are disabled unless `rate_limited`, since every target is
+    on the same loopback address. With `measure_memory` the peak Python
+    heap allocated during the run is traced, which slows the run a little.
+    """
+    rate_limits = None if rate_limited else EndpointRateLimits(0, 0)
+    
+    if measure_memory:
+        tracemalloc.start()
+    started = time.monotonic()
+    try:
+        results = [
+            result for target, result in iter_scan_targets(
+                targets, concurrency, connect_timeout, handshake_timeout, rate_limits
+            )
+        ]
+        elapsed = time.monotonic() - started
+        peak_memory = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    finally:
+        if measure_memory:
+            tracemalloc.stop()
+    
+    return _summarize(elapsed, results, peak_memory)
+
+
+def run_benchmark(sizes=(10, 1000, 10000), concurrency=None, connect_timeout=2,
+                  handshake_timeout=3, sequential_sample=100, rate_limited=False,
+                  measure_memory=True, servers=None, mix=None):
+    """Run the benchmark for each target count and return a report dict
+    
+    The synchronous scan_domain() is measured on at most
+    `sequential_sample` targets per size, since it scans one at a time.
+    """
+    servers = servers or TestServers()
+    report = {
+        'started': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'openssl': ssl.OPENSSL_VERSION,
+        'concurrency': concurrency,
+        'connect_timeout': connect_timeout,
+        'handshake_timeout': handshake_timeout,
+        'rate_limited': rate_limited,
+        'servers': servers.counts,
+        'slow_delay': servers.slow_delay,
+        'runs': [],
+    }
+    
+    with servers:
+        for size in sizes:
+            targets = servers.targets(size, mix)
+            get_dns_cache().clear()
+            run = {'size': size}
+            if sequential_sample:
+                run['scan_domain'] = benchmark_scan_domain(
+                    targets[:sequential_sample], connect_timeout + handshake_timeout
+                )
+            run['bulk_scan_domains'] = benchmark_bulk_scan(
+                targets, concurrency, connect_timeout, handshake_timeout,
+                rate_limited, measure_memory
+            )
+            report['runs'].append(run)
+    
+    return report
+
+
+def write_run(mode, summary):
+    latencies = ', '.join(
+        f'p{pct} {summary[f"latency_p{pct}"] * 1000:.1f} ms'
+        for pct in (50, 95, 99)
+        if summary[f'latency_p{pct}'] is not None
+    )
+    failed = ', '.join(f'{cls} {count}' for cls, count in sorted(summary['failed'].items()))
+    
+    print(f'  {mode}:')
+    print(
+        f'    {summary["targets"]} scanned in {summary["elapsed"]:.2f} s '
+        f'({summary["throughput"]:.1f} targets/s), {summary["succeeded"]} succeeded'
+    )
+    if failed:
+        print(f'    Failed: {failed}')
+    if latencies:
+        print(f'    Latency: {latencies}')
+    if 'peak_memory' in summary:
+        print(f'    Peak memory: {summary["peak_memory"] / 1024 / 1024:.1f} MiB')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark the scanner against local TLS servers (healthy, slow, dead and broken)'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=str,
+        default='10,1000,10000',
+        help='Comma-separated target counts to benchmark (default: 10,1000,10000)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        help='Concurrent handshakes for bulk scans (default: scan_concurrency setting)'
+    )
+    parser.add_argument(
+        '--connect-timeout',
+        type=float,
+        default=2,
+        help='Connect timeout in seconds (default: 2)'
+    )
+    parser.add_argument(
+        '--handshake-timeout',
+        type=float,
+        default=3,
+        help='Handshake timeout in seconds (default: 3)'
+    )
+    parser.add_argument(
+        '--sequential-sample',
+        type=int,
+        default=100,
+        help='Targets scanned one by one with scan_domain per size, 0 to skip (default: 100)'
+    )
+    parser.add_argument(
+        '--servers',
+        type=str,
+        default='10,2,2,2',
+        help='Number of healthy,slow,dead,broken servers (default: 10,2,2,2)'
+    )
+    parser.add_argument(
+        '--slow-delay',
+        type=float,
+        default=2.0,
+        help='Seconds slow servers wait before the handshake (default: 2)'
+    )
+    parser.add_argument(
+        '--rate-limited',
+        action='store_true',
+        help='Keep the per-IP/subnet rate limits (all servers share one address)'
+    )
+    parser.add_argument(
+        '--no-memory',
+        action='store_true',
+        help='Do not trace memory usage'
+    )
+    parser.add_argument(
+        '--json',
+        type=str,
+        help='Write the full report as JSON to this file, for comparison between runs'
+    )
+    options = parser.parse_args()
+    
+    try:
+        sizes = [int(size) for size in options.sizes.split(',') if size.strip()]
+        healthy, slow, dead, broken = [int(n) for n in options.servers.split(',')]
+    except ValueError:
+        parser.error('--sizes and --servers take comma-separated integers (--servers needs four)')
+    if not healthy:
+        parser.error('At least one healthy server is required')
+    
+    servers = TestServers(healthy, slow, dead, broken, options.slow_delay)
+    report = run_benchmark(
+        sizes,
+        concurrency=options.concurrency,
+        connect_timeout=options.connect_timeout,
+        handshake_timeout=options.handshake_timeout,
+        sequential_sample=options.sequential_sample,
+        rate_limited=options.rate_limited,
+        measure_memory=not options.no_memory,
+        servers=servers,
+    )
+    
+    for run in report['runs']:
+        print(f'\n{run["size"]} targets:')
+        for mode in ('scan_domain', 'bulk_scan_domains'):
+            if mode in run:
+                write_run(mode, run[mode])
+    
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\n✓ Report written to {options.json}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,5 @@
 from netbox.plugins import PluginConfig
+from .config import DEFAULT_SETTINGS
 
 class SSLCertificatesConfig(PluginConfig):
     name = 'netbox_ssl_certificates'
@@ -8,13 +9,16 @@ class SSLCertificatesConfig(PluginConfig):
     author = 'Mikhail Voronov'
     author_email = 'mikhail.voronov@gmail.com'
     base_url = 'ssl-certificates'
-    min_version = '4.0.0'
+    min_version = '4.1.0'
     max_version = '4.9.99'
     required_settings = []
-    default_settings = {
-        'expiry_warning_days': 30,
-        'enable_notifications': True,
-        'notification_emails': [],
-    }
+    default_settings = DEFAULT_SETTINGS
+
+    def ready(self):
+        super().ready()
+        from .config import get_plugin_setting
+        from .utils import certificate_cache
+        
+        certificate_cache.resize(get_plugin_setting('certificate_cache_size'))
     
 config = SSLCertificatesConfig
\ No newline at end of file
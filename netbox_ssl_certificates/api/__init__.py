@@ -1,3 +1,3 @@
-from .views import CertificateViewSet
+from .views import CertificateViewSet, ScanTargetViewSet
 
-__all__ = ['CertificateViewSet']
\ No newline at end of file
+__all__ = ['CertificateViewSet', 'ScanTargetViewSet']
\ No newline at end of file
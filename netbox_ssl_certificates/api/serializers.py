@@ -1,6 +1,9 @@
 from rest_framework import serializers
 from netbox.api.serializers import NetBoxModelSerializer
-from netbox_ssl_certificates.models import Certificate
+from dcim.api.serializers import DeviceSerializer
+from virtualization.api.serializers import VirtualMachineSerializer
+from netbox_ssl_certificates.config import get_plugin_setting
+from netbox_ssl_certificates.models import Certificate, ScanTarget
 
 
 class CertificateSerializer(NetBoxModelSerializer):
@@ -11,6 +14,8 @@ class CertificateSerializer(NetBoxModelSerializer):
     )
     
     display = serializers.SerializerMethodField()
+    is_expired = serializers.BooleanField(read_only=True)
+    days_until_expiry = serializers.IntegerField(read_only=True, allow_null=True)
     status = serializers.CharField(read_only=True)
     status_color = serializers.CharField(read_only=True)
     
@@ -21,16 +26,63 @@ class CertificateSerializer(NetBoxModelSerializer):
             'private_key', 'common_name', 'subject_alternative_names', 'issuer', 
             'serial_number', 'valid_from', 'valid_until', 'fingerprint_sha256', 
             'is_self_signed', 'key_size', 'algorithm', 'is_expired', 
-            'days_until_expiry', 'status', 'status_color', 'comments',
+            'days_until_expiry', 'status', 'status_color', 'last_seen', 'comments',
             'created', 'last_updated', 'tags', 'custom_fields'
         ]
         read_only_fields = [
             'common_name', 'subject_alternative_names', 'issuer', 'serial_number',
             'valid_from', 'valid_until', 'fingerprint_sha256', 'is_self_signed',
             'key_size', 'algorithm', 'is_expired', 'days_until_expiry', 'status',
-            'status_color', 'display'
+            'status_color', 'last_seen', 'display'
         ]
         brief_fields = ['id', 'url', 'display', 'name', 'common_name']
     
     def get_display(self, obj):
-        return str(obj)
\ No newline at end of file
+        return str(obj)
+
+
+class ScanTargetSerializer(NetBoxModelSerializer):
+    """REST API serializer for ScanTarget model"""
+    
+    url = serializers.HyperlinkedIdentityField(
+        view_name='plugins-api:netbox_ssl_certificates-api:scantarget-detail'
+    )
+    
+    display = serializers.SerializerMethodField()
+    certificate = CertificateSerializer(nested=True, read_only=True)
+    device = DeviceSerializer(nested=True, required=False, allow_null=True)
+    virtual_machine = VirtualMachineSerializer(nested=True, required=False, allow_null=True)
+    circuit_open = serializers.BooleanField(read_only=True)
+    
+    class Meta:
+        model = ScanTarget
+        fields = [
+            'id', 'url', 'display', 'hostname', 'port', 'name', 'certificate',
+            'device', 'virtual_machine', 'enabled', 'next_scan_at', 'last_scanned', 'last_fingerprint',
+            'last_changed', 'last_error', 'last_error_class', 'consecutive_failures',
+            'circuit_open', 'description', 'comments',
+            'created', 'last_updated', 'tags', 'custom_fields'
+        ]
+        read_only_fields = [
+            'certificate', 'last_scanned', 'last_fingerprint', 'last_changed', 'last_error',
+            'last_error_class', 'consecutive_failures', 'display'
+        ]
+        brief_fields = ['id', 'url', 'display', 'hostname', 'port']
+    
+    def get_display(self, obj):
+        return str(obj)
+
+
+class CoverageRequestSerializer(serializers.Serializer):
+    """Hostnames to check with the certificate coverage endpoint"""
+    
+    hostnames = serializers.ListField(
+        child=serializers.CharField(max_length=255),
+        allow_empty=False
+    )
+    
+    def validate_hostnames(self, value):
+        max_hostnames = get_plugin_setting('coverage_max_hostnames')
+        if len(value) > max_hostnames:
+            raise serializers.ValidationError(f'At most {max_hostnames} hostnames per request')
+        return value
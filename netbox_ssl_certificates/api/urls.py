@@ -1,9 +1,10 @@
 from netbox.api.routers import NetBoxRouter
-from .views import CertificateViewSet
+from .views import CertificateViewSet, ScanTargetViewSet
 
 app_name = 'netbox_ssl_certificates-api'
 
 router = NetBoxRouter()
 router.register('certificates', CertificateViewSet)
+router.register('scan-targets', ScanTargetViewSet)
 
 urlpatterns = router.urls
\ No newline at end of file
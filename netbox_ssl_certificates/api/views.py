@@ -1,12 +1,75 @@
+from drf_spectacular.utils import extend_schema
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.viewsets import NetBoxModelViewSet
-from netbox_ssl_certificates.models import Certificate
-from netbox_ssl_certificates.filtersets import CertificateFilterSet
-from .serializers import CertificateSerializer
+from netbox_ssl_certificates.coverage import check_coverage
+from netbox_ssl_certificates.models import Certificate, ScanTarget
+from netbox_ssl_certificates.filtersets import CertificateFilterSet, ScanTargetFilterSet
+from .serializers import CertificateSerializer, CoverageRequestSerializer, ScanTargetSerializer
 
 
 class CertificateViewSet(NetBoxModelViewSet):
     """REST API viewset for Certificate model"""
     
-    queryset = Certificate.objects.prefetch_related('tags')
+    queryset = Certificate.objects.with_expiry().prefetch_related('tags')
     serializer_class = CertificateSerializer
-    filterset_class = CertificateFilterSet
\ No newline at end of file
+    filterset_class = CertificateFilterSet
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Brief representations only need the name and common name
+        if self.brief:
+            queryset = queryset.without_content()
+        return queryset
+    
+    @extend_schema(request=CoverageRequestSerializer)
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='coverage',
+        permission_classes=[IsAuthenticatedOrLoginNotRequired]
+    )
+    def coverage(self, request):
+        """Return the best valid certificate covering each of the given hostnames
+
+        Read-only: needs only view permission on certificates, and only
+        certificates the user may view are considered.
+        """
+        serializer = CoverageRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        hostnames = list(dict.fromkeys(serializer.validated_data['hostnames']))
+        
+        coverage = check_coverage(
+            hostnames,
+            queryset=Certificate.objects.restrict(request.user, 'view')
+        )
+        
+        results = []
+        for hostname in hostnames:
+            certificate, wildcard = coverage[hostname]
+            results.append({
+                'hostname': hostname,
+                'covered': certificate is not None,
+                'wildcard': wildcard,
+                'certificate': CertificateSerializer(
+                    certificate, nested=True, context={'request': request}
+                ).data if certificate else None,
+                'valid_until': certificate.valid_until if certificate else None,
+                'days_until_expiry': certificate.days_until_expiry if certificate else None,
+            })
+        return Response({
+            'count': len(results),
+            'covered': sum(1 for result in results if result['covered']),
+            'results': results,
+        })
+
+
+class ScanTargetViewSet(NetBoxModelViewSet):
+    """REST API viewset for ScanTarget model"""
+    
+    queryset = ScanTarget.objects.select_related(
+        'certificate', 'device', 'virtual_machine'
+    ).prefetch_related('tags')
+    serializer_class = ScanTargetSerializer
+    filterset_class = ScanTargetFilterSet
@@ -0,0 +1,60 @@
+"""Plugin settings and their defaults
+
+DEFAULT_SETTINGS is the only place defaults are defined. PluginConfig uses
+it as default_settings, and get_plugin_setting() falls back to it when
+PLUGINS_CONFIG has no value.
+"""
+from django.conf import settings
+
+DEFAULT_SETTINGS = {
+    'expiry_warning_days': 30,
+    'enable_notifications': True,
+    'notification_emails': [],
+
+    # Scan engine
+    'scan_concurrency': 50,
+    'scan_connect_timeout': 5,
+    'scan_handshake_timeout': 10,
+    'scan_dns_ttl': 300,
+    'scan_lease_seconds': 600,
+    # Targets leased per batch by a sweep; each batch must finish within
+    # scan_lease_seconds
+    'scan_lease_batch_size': 500,
+    'scan_rate_per_ip': 20,
+    'scan_rate_per_subnet': 100,
+    'sweep_probe_timeout': 1,
+    'sweep_subnet_rate': 50,
+    'sni_pool_size': 4,
+    'scan_history_batch_size': 500,
+    'scan_history_retention_days': 90,
+
+    # Rescan interval rules as (max days until expiry, interval in hours),
+    # checked in order; a max of None matches everything
+    'rescan_intervals': [(7, 1), (30, 24), (None, 168)],
+    # Interval used when the expiry of an endpoint's certificate is unknown
+    'rescan_unknown_expiry_interval_hours': 24,
+    # Certificates that changed recently are rescanned at least this often
+    'rescan_recent_change_days': 7,
+    'rescan_recent_change_interval_hours': 6,
+
+    # Failing endpoints back off exponentially from the base delay up to the
+    # cap; after the threshold the circuit opens and they are only probed
+    'scan_backoff_base_minutes': 15,
+    'scan_backoff_max_hours': 24,
+    'scan_circuit_threshold': 5,
+    'scan_circuit_probe_hours': 168,
+
+    # Service ports treated as TLS endpoints, and ports scanned on
+    # device/VM primary IPs without a matching service
+    'discovery_tls_ports': [443, 465, 636, 853, 993, 995, 5986, 6443, 8443, 9443],
+    'discovery_primary_ip_ports': [443],
+
+    'certificate_cache_size': 1024,
+    'coverage_max_hostnames': 10000,
+}
+
+
+def get_plugin_setting(name):
+    """Return a plugin setting from PLUGINS_CONFIG or its default"""
+    plugin_config = settings.PLUGINS_CONFIG.get('netbox_ssl_certificates', {})
+    return plugin_config.get(name, DEFAULT_SETTINGS[name])
@@ -0,0 +1,128 @@
+"""Hostname coverage lookups over certificate CNs and SANs
+
+Names are held in a trie keyed by reversed labels (com -> example -> api),
+so looking up a hostname walks one node per label. The trie is built from
+CertificateName rows and cached per process until the names change.
+"""
+import threading
+from django.db.models import Count, Max
+from django.utils import timezone as django_timezone
+from .models import Certificate, CertificateName
+from .utils import normalize_hostname
+
+WILDCARD = '*'
+
+# Key under which a node keeps the certificate ids issued for its name
+CERTIFICATES = None
+
+
+class HostnameTrie:
+    """Reversed-label trie mapping names to the certificates issued for them
+
+    Each node is a dict of child label -> node, plus the set of certificate
+    ids issued for the name ending there. Wildcard names are stored as a
+    '*' child of their parent domain.
+    """
+
+    def __init__(self):
+        self.root = {}
+
+    def add(self, name, certificate_id):
+        node = self.root
+        for label in reversed(name.split('.')):
+            node = node.setdefault(label, {})
+        node.setdefault(CERTIFICATES, set()).add(certificate_id)
+
+    def match(self, hostname):
+        """Return (exact ids, wildcard ids) of the certificates covering hostname
+
+        A wildcard covers exactly one label: *.example.com matches
+        api.example.com but neither example.com nor a.b.example.com.
+        """
+        labels = normalize_hostname(hostname).split('.')
+        if not labels[0]:
+            return set(), set()
+        
+        # Walk down to the parent domain, then look at its children
+        parent = self.root
+        for label in reversed(labels[1:]):
+            parent = parent.get(label)
+            if parent is None:
+                return set(), set()
+        
+        exact = parent.get(labels[0], {}).get(CERTIFICATES, set())
+        wildcard = set()
+        if len(labels) > 1:
+            wildcard = parent.get(WILDCARD, {}).get(CERTIFICATES, set())
+        return exact, wildcard
+
+
+def coverage_version():
+    """Return a key that changes whenever any certificate name changes
+
+    Names are replaced, never updated in place, so their count and highest
+    id change on every save that touches a CN or SAN and on every delete.
+    """
+    names = CertificateName.objects.aggregate(count=Count('pk'), last=Max('pk'))
+    return (names['count'], names['last'])
+
+
+_cache_lock = threading.Lock()
+_cache = {'version': None, 'trie': None}
+
+
+def build_trie():
+    trie = HostnameTrie()
+    for certificate_id, name in CertificateName.objects.values_list(
+        'certificate_id', 'name'
+    ).iterator(chunk_size=10000):
+        trie.add(name, certificate_id)
+    return trie
+
+
+def get_trie():
+    """Return the cached trie, rebuilding it if the names changed"""
+    version = coverage_version()
+    with _cache_lock:
+        if _cache['version'] != version:
+            _cache['trie'] = build_trie()
+            _cache['version'] = version
+        return _cache['trie']
+
+
+def check_coverage(hostnames, queryset=None, now=None):
+    """Return {hostname: (certificate, matched by wildcard)} for each hostname
+
+    The best certificate is the currently valid one in `queryset` that
+    expires last, preferring an exact name over a wildcard on ties.
+    Hostnames with no valid certificate map to (None, False). Validity is
+    read from the database on each call, so only the names are cached.
+    """
+    if queryset is None:
+        queryset = Certificate.objects.all()
+    if now is None:
+        now = django_timezone.now()
+    trie = get_trie()
+    
+    matches = {hostname: trie.match(hostname) for hostname in hostnames}
+    candidates = set()
+    for exact, wildcard in matches.values():
+        candidates |= exact | wildcard
+    
+    certificates = {}
+    if candidates:
+        certificates = queryset.without_content().filter(
+            pk__in=candidates,
+            valid_from__lte=now,
+            valid_until__gt=now
+        ).in_bulk()
+    
+    coverage = {}
+    for hostname, (exact, wildcard) in matches.items():
+        best = max(
+            [(certificates[pk].valid_until, True, pk) for pk in exact if pk in certificates] +
+            [(certificates[pk].valid_until, False, pk) for pk in wildcard if pk in certificates],
+            default=None
+        )
+        coverage[hostname] = (certificates[best[2]], not best[1]) if best else (None, False)
+    return coverage
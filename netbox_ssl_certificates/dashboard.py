@@ -13,30 +13,16 @@ class CertificateStatsWidget(PluginTemplateExtension):
         """Get certificate statistics"""
         
         # Общая статистика
-        total = Certificate.objects.count()
-        expired = Certificate.objects.filter(is_expired=True).count()
-        expiring_soon = Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=30,
-            days_until_expiry__gte=0
-        ).count()
-        valid = Certificate.objects.filter(
-            is_expired=False
-        ).exclude(
-            days_until_expiry__lte=30
-        ).count()
+        summary = Certificate.objects.expiry_summary()
         
         # Ближайшие к истечению
-        expiring_certificates = Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__gte=0
-        ).order_by('valid_until')[:5]
+        expiring_certificates = Certificate.objects.without_content().expiring_between(0).order_by('valid_until')[:5]
         
         return {
-            'total': total,
-            'expired': expired,
-            'expiring_soon': expiring_soon,
-            'valid': valid,
+            'total': summary['total'],
+            'expired': summary['expired'],
+            'expiring_soon': summary['expiring_soon'],
+            'valid': summary['valid'],
             'expiring_certificates': expiring_certificates,
             'certificate_list_url': reverse('plugins:netbox_ssl_certificates:certificate_list'),
         }
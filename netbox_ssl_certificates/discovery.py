@@ -0,0 +1,183 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from dcim.models import Device
+from ipam.models import Service
+from virtualization.models import VirtualMachine
+from .config import get_plugin_setting
+from .models import Certificate, ScanTarget
+import logging
+
+logger = logging.getLogger('netbox.plugins.netbox_ssl_certificates')
+
+def _ip_hostname(ip_address):
+    """Prefer the DNS name of an IPAddress, falling back to the bare address"""
+    return ip_address.dns_name or str(ip_address.address.ip)
+
+
+def _service_parent(service):
+    """Return (device_id, virtual_machine_id) for a service
+
+    NetBox 4.3 replaced the device/virtual_machine fields of Service with a
+    generic parent; both layouts are supported.
+    """
+    if hasattr(service, 'parent_object_type_id'):
+        if not service.parent_object_type_id:
+            return None, None
+        model = ContentType.objects.get_for_id(service.parent_object_type_id).model_class()
+        if model is Device:
+            return service.parent_object_id, None
+        if model is VirtualMachine:
+            return None, service.parent_object_id
+        return None, None
+    
+    return service.device_id, service.virtual_machine_id
+
+
+def discover_candidates(tls_ports=None, primary_ip_ports=None):
+    """Collect candidate scan endpoints from IPAM services and primary IPs
+
+    Returns a dict mapping (hostname, port) to (device_id, virtual_machine_id).
+    Services on TLS ports are considered first; devices and VMs with a
+    primary IP contribute their primary address on `primary_ip_ports`.
+    Everything is loaded in a handful of batched queries.
+    """
+    if tls_ports is None:
+        tls_ports = get_plugin_setting('discovery_tls_ports')
+    if primary_ip_ports is None:
+        primary_ip_ports = get_plugin_setting('discovery_primary_ip_ports')
+    tls_ports = set(tls_ports)
+    
+    candidates = {}
+    
+    def add(hostname, port, device_id, virtual_machine_id):
+        candidates.setdefault((hostname.lower(), port), (device_id, virtual_machine_id))
+    
+    # Services on TLS ports, with their parent's primary IPs as a fallback
+    services = list(
+        Service.objects.filter(ports__overlap=list(tls_ports)).prefetch_related('ipaddresses')
+    )
+    parents = [_service_parent(service) for service in services]
+    devices = Device.objects.select_related('primary_ip4', 'primary_ip6').in_bulk(
+        {device_id for device_id, vm_id in parents if device_id}
+    )
+    virtual_machines = VirtualMachine.objects.select_related('primary_ip4', 'primary_ip6').in_bulk(
+        {vm_id for device_id, vm_id in parents if vm_id}
+    )
+    
+    for service, (device_id, vm_id) in zip(services, parents):
+        ip_addresses = list(service.ipaddresses.all())
+        if not ip_addresses:
+            parent = devices.get(device_id) or virtual_machines.get(vm_id)
+            primary_ip = parent and (parent.primary_ip4 or parent.primary_ip6)
+            ip_addresses = [primary_ip] if primary_ip else []
+        
+        for ip_address in ip_addresses:
+            for port in tls_ports.intersection(service.ports):
+                add(_ip_hostname(ip_address), port, device_id, vm_id)
+    
+    # Primary IPs of devices and virtual machines
+    has_primary_ip = Q(primary_ip4__isnull=False) | Q(primary_ip6__isnull=False)
+    for model, is_device in ((Device, True), (VirtualMachine, False)):
+        objects = model.objects.filter(has_primary_ip).select_related(
+            'primary_ip4', 'primary_ip6'
+        ).only(
+            'pk', 'primary_ip4__address', 'primary_ip4__dns_name',
+            'primary_ip6__address', 'primary_ip6__dns_name'
+        )
+        for obj in objects:
+            primary_ip = obj.primary_ip4 or obj.primary_ip6
+            for port in primary_ip_ports:
+                if is_device:
+                    add(_ip_hostname(primary_ip), port, obj.pk, None)
+                else:
+                    add(_ip_hostname(primary_ip), port, None, obj.pk)
+    
+    return candidates
+
+
+def sync_scan_targets(candidates):
+    """Create missing ScanTargets for discovered endpoints
+
+    Existing targets keep their settings but get their device/VM link
+    filled in when it is missing. Candidate hostnames are lower-case and
+    are matched against stored hostnames case-insensitively. Returns the
+    (created, linked) counts of rows actually written.
+    """
+    existing = {}
+    hostnames = {hostname for hostname, port in candidates}
+    for target in ScanTarget.objects.annotate(
+        hostname_lower=Lower('hostname')
+    ).filter(hostname_lower__in=hostnames).only(
+        'pk', 'hostname', 'port', 'device', 'virtual_machine'
+    ):
+        existing.setdefault((target.hostname_lower, target.port), target)
+    
+    new_targets = []
+    relinked = []
+    for (hostname, port), (device_id, vm_id) in candidates.items():
+        target = existing.get((hostname, port))
+        if target is None:
+            new_targets.append(ScanTarget(
+                hostname=hostname,
+                port=port,
+                device_id=device_id,
+                virtual_machine_id=vm_id,
+                description='Discovered from NetBox IPAM',
+            ))
+        elif not target.device_id and not target.virtual_machine_id and (device_id or vm_id):
+            target.device_id = device_id
+            target.virtual_machine_id = vm_id
+            relinked.append(target)
+    
+    # ignore_conflicts skips rows added concurrently, so count what landed
+    with transaction.atomic():
+        before = ScanTarget.objects.count()
+        ScanTarget.objects.bulk_create(new_targets, batch_size=1000, ignore_conflicts=True)
+        created = ScanTarget.objects.count() - before
+        linked = ScanTarget.objects.bulk_update(relinked, ['device', 'virtual_machine'], batch_size=1000)
+    
+    logger.info(f"Discovery created {created} and linked {linked} scan targets")
+    return created, linked
+
+
+def link_certificates(links):
+    """Assign certificates to devices/VMs through bulk through-table inserts
+
+    `links` is an iterable of (certificate_id, device_id, virtual_machine_id)
+    tuples; either object id may be None. Existing assignments are left
+    alone, and no per-object .add() calls (or their signals) are made.
+    """
+    DeviceLink = Certificate.devices.through
+    VirtualMachineLink = Certificate.virtual_machines.through
+    
+    device_links = set()
+    vm_links = set()
+    for certificate_id, device_id, vm_id in links:
+        if not certificate_id:
+            continue
+        if device_id:
+            device_links.add((certificate_id, device_id))
+        if vm_id:
+            vm_links.add((certificate_id, vm_id))
+    
+    DeviceLink.objects.bulk_create(
+        [DeviceLink(certificate_id=c, device_id=d) for c, d in device_links],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+    VirtualMachineLink.objects.bulk_create(
+        [VirtualMachineLink(certificate_id=c, virtualmachine_id=v) for c, v in vm_links],
+        batch_size=1000,
+        ignore_conflicts=True
+    )
+
+
+def link_scanned_certificates():
+    """Link every scanned certificate to the device/VM of its scan target"""
+    link_certificates(
+        ScanTarget.objects.filter(certificate__isnull=False).filter(
+            Q(device__isnull=False) | Q(virtual_machine__isnull=False)
+        ).values_list('certificate_id', 'device_id', 'virtual_machine_id')
+    )
@@ -1,5 +1,14 @@
 from netbox.filtersets import NetBoxModelFilterSet
-from .models import Certificate
+from .models import (
+    Certificate,
+    CertificateName,
+    ScanTarget,
+    SCAN_ERROR_CLASS_CHOICES,
+    hostname_q,
+    hostname_suffix_q,
+)
+from dcim.models import Device
+from virtualization.models import VirtualMachine
 from django.db import models
 import django_filters
 
@@ -22,9 +31,29 @@ class CertificateFilterSet(NetBoxModelFilterSet):
         label='Status'
     )
     
+    is_expired = django_filters.BooleanFilter(
+        method='filter_is_expired',
+        label='Expired'
+    )
+    
+    expires_within = django_filters.NumberFilter(
+        method='filter_expires_within',
+        label='Expires within (days)'
+    )
+    
+    hostname = django_filters.CharFilter(
+        method='filter_hostname',
+        label='Covers hostname'
+    )
+    
+    hostname_suffix = django_filters.CharFilter(
+        method='filter_hostname_suffix',
+        label='Names under domain'
+    )
+    
     class Meta:
         model = Certificate
-        fields = ['id', 'name', 'common_name', 'issuer', 'is_expired', 'is_self_signed']
+        fields = ['id', 'name', 'common_name', 'issuer', 'is_self_signed']
     
     def search(self, queryset, name, value):
         """Custom search method"""
@@ -34,29 +63,112 @@ class CertificateFilterSet(NetBoxModelFilterSet):
             models.Q(name__icontains=value) |
             models.Q(common_name__icontains=value) |
             models.Q(issuer__icontains=value) |
-            models.Q(description__icontains=value)
+            models.Q(description__icontains=value) |
+            models.Q(pk__in=CertificateName.objects.filter(
+                name__icontains=value.strip()
+            ).values('certificate_id'))
         )
     
     def filter_status(self, queryset, name, value):
         """Filter by certificate status"""
-        from django.db.models import Q
-        from datetime import datetime, timezone
-        
-        now = datetime.now(timezone.utc)
-        
         if value == 'expired':
-            return queryset.filter(is_expired=True)
+            return queryset.expired()
         elif value == 'expiring_soon':
-            return queryset.filter(
-                is_expired=False,
-                days_until_expiry__lte=30,
-                days_until_expiry__gte=0
-            )
+            return queryset.expiring_within()
         elif value == 'valid':
-            return queryset.filter(
-                is_expired=False
-            ).exclude(
-                days_until_expiry__lte=30
-            )
+            return queryset.valid()
         
-        return queryset
\ No newline at end of file
+        return queryset
+    
+    def filter_is_expired(self, queryset, name, value):
+        if value is None:
+            return queryset
+        return queryset.expired() if value else queryset.not_expired()
+    
+    def filter_expires_within(self, queryset, name, value):
+        if value is None:
+            return queryset
+        return queryset.expiring_within(int(value))
+    
+    def filter_hostname(self, queryset, name, value):
+        """Certificates whose CN or SANs cover the hostname, wildcards included"""
+        if not value.strip():
+            return queryset
+        return queryset.filter(
+            pk__in=CertificateName.objects.filter(hostname_q(value)).values('certificate_id')
+        )
+    
+    def filter_hostname_suffix(self, queryset, name, value):
+        """Certificates with a CN or SAN equal to or under the domain"""
+        if not value.strip():
+            return queryset
+        return queryset.filter(
+            pk__in=CertificateName.objects.filter(hostname_suffix_q(value)).values('certificate_id')
+        )
+
+
+class ScanTargetFilterSet(NetBoxModelFilterSet):
+    """FilterSet for scan targets"""
+    
+    q = django_filters.CharFilter(
+        method='search',
+        label='Search',
+    )
+    
+    certificate_id = django_filters.ModelMultipleChoiceFilter(
+        queryset=Certificate.objects.all(),
+        label='Certificate'
+    )
+    
+    device_id = django_filters.ModelMultipleChoiceFilter(
+        queryset=Device.objects.all(),
+        label='Device'
+    )
+    
+    virtual_machine_id = django_filters.ModelMultipleChoiceFilter(
+        queryset=VirtualMachine.objects.all(),
+        label='Virtual machine'
+    )
+    
+    failing = django_filters.BooleanFilter(
+        method='filter_failing',
+        label='Failing'
+    )
+    
+    last_error_class = django_filters.MultipleChoiceFilter(
+        choices=SCAN_ERROR_CLASS_CHOICES,
+        label='Last error class'
+    )
+    
+    circuit_open = django_filters.BooleanFilter(
+        method='filter_circuit_open',
+        label='Circuit open'
+    )
+    
+    class Meta:
+        model = ScanTarget
+        fields = ['id', 'hostname', 'port', 'name', 'enabled', 'last_fingerprint']
+    
+    def search(self, queryset, name, value):
+        """Custom search method"""
+        if not value.strip():
+            return queryset
+        return queryset.filter(
+            models.Q(hostname__icontains=value) |
+            models.Q(name__icontains=value) |
+            models.Q(description__icontains=value)
+        )
+    
+    def filter_failing(self, queryset, name, value):
+        """Filter by whether the last scan failed"""
+        if value:
+            return queryset.filter(consecutive_failures__gt=0)
+        return queryset.filter(consecutive_failures=0)
+
+    
+    def filter_circuit_open(self, queryset, name, value):
+        """Filter by whether the target only gets occasional probes"""
+        open_targets = queryset.circuit_open()
+        if value:
+            return open_targets
+        return queryset.exclude(pk__in=open_targets.values('pk'))
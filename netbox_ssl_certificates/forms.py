@@ -2,7 +2,9 @@ from django import forms
 from netbox.forms import NetBoxModelForm, NetBoxModelFilterSetForm
 from dcim.models import Device, Site
 from virtualization.models import VirtualMachine
-from .models import Certificate
+from .models import Certificate, ScanTarget, SCAN_ERROR_CLASS_CHOICES
+from .scanner import parse_targets
+from .utils import certificate_cache
 
 # Исправленный импорт для NetBox 4.4
 try:
@@ -144,6 +146,12 @@ class CertificateImportForm(forms.Form):
         if not ('-----BEGIN CERTIFICATE-----' in content and '-----END CERTIFICATE-----' in content):
             raise forms.ValidationError('Invalid certificate format. Must be PEM encoded.')
         
+        # Parse once here; saving the certificate reuses the cached result
+        try:
+            certificate_cache.load_pem(content)
+        except ValueError as e:
+            raise forms.ValidationError(f'Invalid certificate: {str(e)}')
+        
         return content
     
     def clean_private_key_file(self):
@@ -175,6 +183,11 @@ class CertificateImportForm(forms.Form):
         if not ('-----BEGIN CERTIFICATE-----' in content and '-----END CERTIFICATE-----' in content):
             raise forms.ValidationError('Invalid CA certificate format. Must be PEM encoded.')
         
+        try:
+            certificate_cache.load_pem(content)
+        except ValueError as e:
+            raise forms.ValidationError(f'Invalid CA certificate: {str(e)}')
+        
         return content
 
 
@@ -218,6 +231,82 @@ class CertificateScanForm(forms.Form):
     )
 
 
+class CertificateBulkScanForm(forms.Form):
+    """Form for scanning many targets at once"""
+    
+    # Upper bound on targets per bulk scan job
+    max_targets = 10000
+    
+    targets = forms.CharField(
+        required=False,
+        label='Targets',
+        help_text='One target per line: host[:port][,certificate name]',
+        widget=forms.Textarea(attrs={
+            'rows': 12,
+            'class': 'font-monospace',
+            'placeholder': 'example.com\nmail.example.com:993\n192.168.1.1:8443,Core switch'
+        })
+    )
+    
+    targets_file = forms.FileField(
+        required=False,
+        label='Targets File',
+        help_text='Or upload a text file with one target per line',
+        widget=forms.FileInput(attrs={'accept': '.txt,.csv,.list'})
+    )
+    
+    port = forms.IntegerField(
+        initial=443,
+        min_value=1,
+        max_value=65535,
+        label='Default Port',
+        help_text='Port for targets without an explicit port'
+    )
+    
+    concurrency = forms.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=1000,
+        label='Concurrency',
+        help_text='Concurrent handshakes (default: scan_concurrency setting)'
+    )
+    
+    update_existing = forms.BooleanField(
+        required=False,
+        initial=True,
+        label='Update Existing Certificates',
+        help_text='Update certificates that already exist'
+    )
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        
+        lines = (cleaned_data.get('targets') or '').splitlines()
+        targets_file = cleaned_data.get('targets_file')
+        if targets_file:
+            try:
+                lines += targets_file.read().decode('utf-8').splitlines()
+            except UnicodeDecodeError:
+                raise forms.ValidationError('Targets file must be a text file')
+        
+        try:
+            targets = list(dict.fromkeys(
+                parse_targets(lines, cleaned_data.get('port') or 443)
+            ))
+        except ValueError as e:
+            raise forms.ValidationError(str(e))
+        
+        if not targets:
+            raise forms.ValidationError('Enter at least one target')
+        if len(targets) > self.max_targets:
+            raise forms.ValidationError(
+                f'Too many targets ({len(targets)}); the limit is {self.max_targets}'
+            )
+        
+        cleaned_data['parsed_targets'] = targets
+        return cleaned_data
+
+
 class CertificateFilterForm(NetBoxModelFilterSetForm):
     """Filter form for certificates"""
     
@@ -277,4 +366,101 @@ class CertificateFilterForm(NetBoxModelFilterSetForm):
         ])
     )
     
-    tag = TagFilterField(model)
\ No newline at end of file
+    tag = TagFilterField(model)
+
+
+class ScanTargetForm(NetBoxModelForm):
+    """Form for creating/editing scan targets"""
+    
+    device = DynamicModelChoiceField(
+        queryset=Device.objects.all(),
+        required=False,
+        label='Device',
+        help_text='Device serving this endpoint'
+    )
+    
+    virtual_machine = DynamicModelChoiceField(
+        queryset=VirtualMachine.objects.all(),
+        required=False,
+        label='Virtual Machine',
+        help_text='Virtual machine serving this endpoint'
+    )
+    
+    class Meta:
+        model = ScanTarget
+        fields = [
+            'hostname', 'port', 'name', 'device', 'virtual_machine', 'enabled',
+            'next_scan_at', 'description', 'tags', 'comments'
+        ]
+
+
+class ScanTargetFilterForm(NetBoxModelFilterSetForm):
+    """Filter form for scan targets"""
+    
+    model = ScanTarget
+    
+    q = forms.CharField(
+        required=False,
+        label='Search'
+    )
+    
+    port = forms.IntegerField(
+        required=False,
+        label='Port'
+    )
+    
+    enabled = forms.NullBooleanField(
+        required=False,
+        label='Enabled',
+        widget=forms.Select(choices=[
+            ('', '---------'),
+            ('true', 'Yes'),
+            ('false', 'No'),
+        ])
+    )
+    
+    failing = forms.NullBooleanField(
+        required=False,
+        label='Failing',
+        widget=forms.Select(choices=[
+            ('', '---------'),
+            ('true', 'Yes'),
+            ('false', 'No'),
+        ])
+    )
+    
+    last_error_class = forms.MultipleChoiceField(
+        choices=SCAN_ERROR_CLASS_CHOICES,
+        required=False,
+        label='Last Error Class'
+    )
+    
+    circuit_open = forms.NullBooleanField(
+        required=False,
+        label='Circuit Open',
+        widget=forms.Select(choices=[
+            ('', '---------'),
+            ('true', 'Yes'),
+            ('false', 'No'),
+        ])
+    )
+    
+    certificate_id = DynamicModelMultipleChoiceField(
+        queryset=Certificate.objects.all(),
+        required=False,
+        label='Certificate'
+    )
+    
+    device_id = DynamicModelMultipleChoiceField(
+        queryset=Device.objects.all(),
+        required=False,
+        label='Device'
+    )
+    
+    virtual_machine_id = DynamicModelMultipleChoiceField(
+        queryset=VirtualMachine.objects.all(),
+        required=False,
+        label='Virtual Machine'
+    )
+    
+    tag = TagFilterField(model)
@@ -11,35 +11,19 @@ class CertificateStatsPanel(PluginHomePagePanel):
     def get_context_data(self, request):
         """Get certificate statistics"""
         
-        total = Certificate.objects.count()
-        expired = Certificate.objects.filter(is_expired=True).count()
-        expiring_soon = Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=30,
-            days_until_expiry__gte=0
-        ).count()
-        valid = Certificate.objects.filter(
-            is_expired=False
-        ).exclude(
-            days_until_expiry__lte=30
-        ).count()
+        summary = Certificate.objects.expiry_summary()
         
         # Ближайшие к истечению
-        expiring_certificates = Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__gte=0
-        ).order_by('valid_until')[:5]
+        expiring_certificates = Certificate.objects.without_content().expiring_between(0).order_by('valid_until')[:5]
         
         # Недавно истекшие
-        recently_expired = Certificate.objects.filter(
-            is_expired=True
-        ).order_by('-valid_until')[:5]
+        recently_expired = Certificate.objects.without_content().expired().order_by('-valid_until')[:5]
         
         return {
-            'total': total,
-            'expired': expired,
-            'expiring_soon': expiring_soon,
-            'valid': valid,
+            'total': summary['total'],
+            'expired': summary['expired'],
+            'expiring_soon': summary['expiring_soon'],
+            'valid': summary['valid'],
             'expiring_certificates': expiring_certificates,
             'recently_expired': recently_expired,
         }
@@ -0,0 +1,126 @@
+import time
+from collections import Counter
+from core.models import Job
+from dcim.models import Device
+from django.db import transaction
+from netbox.jobs import JobRunner
+from .scanner import (
+    ChainImporter,
+    auto_import_from_domain,
+    import_scan_result,
+    iter_scan_targets,
+    prune_scan_history,
+)
+import logging
+
+logger = logging.getLogger('netbox.plugins.netbox_ssl_certificates')
+
+
+class CertificateScanJob(JobRunner):
+    """Scan a domain and import its certificate outside the web request"""
+
+    class Meta:
+        name = 'SSL Certificate Scan'
+
+    def run(self, hostname, port=443, name=None, update_existing=True, device_id=None, *args, **kwargs):
+        certificate, message = auto_import_from_domain(
+            hostname,
+            port,
+            name,
+            update_existing
+        )
+        
+        if certificate and device_id:
+            device = Device.objects.filter(pk=device_id).first()
+            if device:
+                certificate.devices.add(device)
+        
+        self.job.data = {
+            'success': certificate is not None,
+            'message': message,
+            'hostname': hostname,
+            'port': port,
+            'certificate_id': certificate.pk if certificate else None,
+        }
+        logger.info(f"Scan job for {hostname}:{port} finished: {message}")
+
+
+# Outcome reported for each import_scan_result() message
+IMPORT_OUTCOMES = {
+    'Certificate imported': 'imported',
+    'Certificate updated': 'updated',
+    'Certificate unchanged': 'unchanged',
+    'Certificate already exists (not updated)': 'skipped',
+}
+
+
+class CertificateBulkScanJob(JobRunner):
+    """Scan many targets concurrently and import their certificates
+
+    Progress and per-target outcomes are written to job.data while the
+    job runs, so the status page can show them live.
+    """
+
+    # Minimum seconds between progress writes
+    progress_interval = 1
+
+    class Meta:
+        name = 'SSL Certificate Bulk Scan'
+
+    def run(self, targets, update_existing=True, concurrency=None, *args, **kwargs):
+        counts = Counter()
+        results = []
+        last_progress = 0
+        chain_importer = ChainImporter()
+        
+        self.job.data = {'total': len(targets), 'done': 0, 'counts': {}, 'results': []}
+        self._save_progress()
+        
+        for target, result in iter_scan_targets([tuple(t) for t in targets], concurrency):
+            hostname, port, name = target
+            entry = {
+                'hostname': hostname,
+                'port': port,
+                'outcome': 'failed',
+                'message': result.get('error'),
+                'certificate_id': None,
+            }
+            
+            if result['success']:
+                try:
+                    with transaction.atomic():
+                        certificate, message = import_scan_result(
+                            result, name, update_existing, chain_importer
+                        )
+                    entry.update(
+                        outcome=IMPORT_OUTCOMES.get(message, 'imported'),
+                        message=message,
+                        certificate_id=certificate.pk,
+                    )
+                except Exception as e:
+                    entry['message'] = f"Import failed: {str(e)}"
+            
+            counts[entry['outcome']] += 1
+            results.append(entry)
+            
+            self.job.data.update(done=len(results), counts=dict(counts), results=results)
+            if time.monotonic() - last_progress >= self.progress_interval:
+                self._save_progress()
+                last_progress = time.monotonic()
+        
+        logger.info(f"Bulk scan job finished: {dict(counts)}")
+
+    def _save_progress(self):
+        """Write job.data without touching the rest of the job row"""
+        Job.objects.filter(pk=self.job.pk).update(data=self.job.data)
+
+
+class ScanHistoryRetentionJob(JobRunner):
+    """Delete scan history older than scan_history_retention_days"""
+
+    class Meta:
+        name = 'SSL Scan History Retention'
+
+    def run(self, retention_days=None, *args, **kwargs):
+        deleted = prune_scan_history(retention_days)
+        self.job.data = {'deleted': deleted}
@@ -1,8 +1,12 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from django.core.management.base import BaseCommand
 from django.conf import settings
 from django.core.mail import send_mail
-from netbox_ssl_certificates.models import Certificate
-from datetime import datetime, timezone
+from netbox_ssl_certificates.models import METADATA_FIELDS, Certificate, CertificateName, sync_certificate_names
+from netbox_ssl_certificates.utils import parse_certificate_metadata_or_none, pem_to_der
 
 
 class Command(BaseCommand):
@@ -15,22 +19,34 @@ class Command(BaseCommand):
             default=30,
             help='Warn about certificates expiring within this many days'
         )
+        parser.add_argument(
+            '--refresh',
+            action='store_true',
+            help='Re-parse every certificate and update metadata that changed'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Refresh: certificates loaded and written per chunk (default: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            help='Refresh: parser processes (default: number of CPUs)'
+        )
 
     def handle(self, *args, **options):
         warning_days = options['days']
-        now = datetime.now(timezone.utc)
         
-        # Обновляем статус всех сертификатов
-        for cert in Certificate.objects.all():
-            cert.save()  # Это пересчитает все поля
+        # Статус вычисляется из valid_until, пересохранять сертификаты не нужно
+        if options['refresh']:
+            self.refresh(max(1, options['chunk_size']), options['workers'] or os.cpu_count() or 1)
         
         # Находим сертификаты, которые истекают
-        expiring_certs = Certificate.objects.filter(
-            days_until_expiry__lte=warning_days,
-            days_until_expiry__gte=0
-        )
+        expiring_certs = Certificate.objects.without_content().expiring_within(warning_days)
         
-        expired_certs = Certificate.objects.filter(is_expired=True)
+        expired_certs = Certificate.objects.without_content().expired()
         
         if expiring_certs.exists() or expired_certs.exists():
             self.send_notification(expiring_certs, expired_certs)
@@ -42,6 +58,88 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.SUCCESS('All certificates are valid'))
 
+    def refresh(self, chunk_size, workers):
+        """Re-derive metadata from every certificate and write back only what changed
+
+        Rows are streamed in chunks, parsed from the stored DER in a process
+        pool and written with one bulk_update per chunk, so memory stays flat
+        and no changelog entries are created. Rows without DER yet are read
+        in a second pass that loads the PEM and fills in their DER.
+        """
+        started = time.monotonic()
+        certificates = Certificate.objects.exclude(certificate_file='').order_by('pk')
+        
+        total = updated = failed = 0
+        pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            for der, fields in ((True, ('certificate_der',)), (False, ('certificate_file',))):
+                rows = certificates.filter(certificate_der__isnull=not der).only(
+                    *fields, *METADATA_FIELDS
+                ).iterator(chunk_size=chunk_size)
+                while True:
+                    chunk = list(islice(rows, chunk_size))
+                    if not chunk:
+                        break
+                    
+                    chunk_updated, chunk_failed = self.refresh_chunk(chunk, der, pool, workers)
+                    total += len(chunk)
+                    updated += chunk_updated
+                    failed += chunk_failed
+        finally:
+            if pool is not None:
+                pool.shutdown()
+        
+        self.stdout.write(
+            f'Refreshed {total} certificates in {time.monotonic() - started:.1f}s: '
+            f'{updated} updated, {failed} failed to parse'
+        )
+
+    def refresh_chunk(self, chunk, der, pool, workers):
+        """Refresh one chunk read from DER (or PEM); return (updated, failed)"""
+        data = [bytes(cert.certificate_der) if der else cert.certificate_file for cert in chunk]
+        if pool is not None:
+            parsed = pool.map(
+                parse_certificate_metadata_or_none,
+                data,
+                [der] * len(data),
+                chunksize=max(1, len(data) // (workers * 4))
+            )
+        else:
+            parsed = map(parse_certificate_metadata_or_none, data, [der] * len(data))
+        
+        # Certificates without name rows yet get them rebuilt as well
+        named = set(CertificateName.objects.filter(
+            certificate_id__in=[cert.pk for cert in chunk]
+        ).values_list('certificate_id', flat=True).distinct())
+        
+        changed = []
+        changed_fields = set()
+        renamed = []
+        failed = 0
+        for cert, metadata in zip(chunk, parsed):
+            if metadata is None:
+                failed += 1
+                self.stdout.write(self.style.ERROR(f'✗ Failed to parse {cert.pk}'))
+                continue
+            
+            fields = [field for field, value in metadata.items() if getattr(cert, field) != value]
+            if not der:
+                metadata['certificate_der'] = pem_to_der(cert.certificate_file)
+                fields.append('certificate_der')
+            if fields:
+                for field in fields:
+                    setattr(cert, field, metadata[field])
+                changed.append(cert)
+                changed_fields.update(fields)
+            if cert.pk not in named or {'common_name', 'subject_alternative_names'} & set(fields):
+                renamed.append(cert)
+        
+        if changed:
+            Certificate.objects.bulk_update(changed, sorted(changed_fields))
+        if renamed:
+            sync_certificate_names(renamed)
+        return len(changed), failed
+
     def send_notification(self, expiring_certs, expired_certs):
         """Send email notification about expiring certificates"""
         
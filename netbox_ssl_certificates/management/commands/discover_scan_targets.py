@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from netbox_ssl_certificates.discovery import (
+    discover_candidates,
+    link_scanned_certificates,
+    sync_scan_targets,
+)
+
+
+class Command(BaseCommand):
+    help = 'Discover scan targets from IPAM services and device/VM primary IPs'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ports',
+            type=str,
+            help='Comma-separated TLS service ports (default: discovery_tls_ports setting)'
+        )
+        parser.add_argument(
+            '--primary-ip-ports',
+            type=str,
+            help='Comma-separated ports to scan on primary IPs (default: discovery_primary_ip_ports setting)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Only list discovered endpoints without creating scan targets'
+        )
+
+    def handle(self, *args, **options):
+        tls_ports = self.parse_ports(options['ports'])
+        primary_ip_ports = self.parse_ports(options['primary_ip_ports'])
+        
+        candidates = discover_candidates(tls_ports, primary_ip_ports)
+        self.stdout.write(f'Discovered {len(candidates)} candidate endpoints')
+        
+        if options['dry_run']:
+            for hostname, port in sorted(candidates):
+                self.stdout.write(f'  {hostname}:{port}')
+            self.stdout.write(self.style.WARNING('\n[DRY RUN] No scan targets created'))
+            return
+        
+        created, linked = sync_scan_targets(candidates)
+        link_scanned_certificates()
+        
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✓ Created {created} scan targets, linked {linked} existing targets'
+            )
+        )
+
+    def parse_ports(self, value):
+        if not value:
+            return None
+        return [int(port) for port in value.split(',') if port.strip()]
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from netbox_ssl_certificates.jobs import ScanHistoryRetentionJob
+from netbox_ssl_certificates.config import get_plugin_setting
+from netbox_ssl_certificates.scanner import prune_scan_history
+
+
+class Command(BaseCommand):
+    help = 'Delete scan history older than the retention period'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Keep this many days of history (default: scan_history_retention_days setting)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=10000,
+            help='Rows deleted per statement (default: 10000)'
+        )
+        parser.add_argument(
+            '--schedule',
+            action='store_true',
+            help='Schedule a daily background retention job instead of pruning now'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        if days is None:
+            days = get_plugin_setting('scan_history_retention_days')
+        
+        if options['schedule']:
+            ScanHistoryRetentionJob.enqueue_once(interval=24 * 60, retention_days=days)
+            self.stdout.write(
+                self.style.SUCCESS(f'✓ Scheduled daily pruning of scan history older than {days} days')
+            )
+            return
+        
+        deleted = prune_scan_history(days, max(1, options['chunk_size']))
+        self.stdout.write(
+            self.style.SUCCESS(f'✓ Deleted {deleted} scan results older than {days} days')
+        )
@@ -1,5 +1,22 @@
-from django.core.management.base import BaseCommand
-from netbox_ssl_certificates.scanner import auto_import_from_domain, scan_domain
+import sys
+import time
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count
+from netbox_ssl_certificates.models import ScanTarget
+from netbox_ssl_certificates.scanner import (
+    ChainImporter,
+    auto_import_from_domain,
+    import_scan_result,
+    iter_scan_targets,
+    iter_sni_fanout,
+    parse_targets,
+    scan_cache_stats,
+    scan_domain,
+    sweep_scan_targets,
+)
+from netbox_ssl_certificates.utils import percentile
 
 
 class Command(BaseCommand):
@@ -9,8 +26,45 @@ class Command(BaseCommand):
         parser.add_argument(
             'hostname',
             type=str,
+            nargs='?',
             help='Domain to scan (e.g., example.com)'
         )
+        parser.add_argument(
+            '--targets-file',
+            type=str,
+            help='Bulk mode: read targets (host[:port][,name] per line) from a file, "-" for stdin'
+        )
+        parser.add_argument(
+            '--due',
+            action='store_true',
+            help='Inventory mode: scan all scan targets that are due'
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            help='Inventory mode: maximum number of due targets to scan'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Bulk/inventory mode: number of concurrent handshakes (default: scan_concurrency setting)'
+        )
+        parser.add_argument(
+            '--sni-fanout',
+            action='store_true',
+            help='Bulk mode: group targets by address and scan their SNI names over a small connection pool'
+        )
+        parser.add_argument(
+            '--pool-size',
+            type=int,
+            help='Bulk mode with --sni-fanout: connections per address (default: sni_pool_size setting)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Bulk mode: number of certificates imported per transaction (default: 100)'
+        )
         parser.add_argument(
             '--port',
             type=int,
@@ -34,6 +88,13 @@ class Command(BaseCommand):
         )
 
     def handle(self, *args, **options):
+        if options['due']:
+            return self.handle_due(options)
+        if options['targets_file']:
+            return self.handle_bulk(options)
+        if not options['hostname']:
+            raise CommandError('Specify a hostname, --targets-file or --due')
+        
         hostname = options['hostname']
         port = options['port']
         name = options.get('name')
@@ -52,7 +113,7 @@ class Command(BaseCommand):
                 )
                 self.stdout.write(f"  Protocol: {result.get('protocol', 'N/A')}")
                 self.stdout.write(f"  Cipher: {result.get('cipher', ['N/A'])[0]}")
-                self.stdout.write(f"\n  Certificate preview:")
+                self.stdout.write("\n  Certificate preview:")
                 cert_lines = result['certificate'].split('\n')
                 for line in cert_lines[:5]:
                     self.stdout.write(f"    {line}")
@@ -74,7 +135,7 @@ class Command(BaseCommand):
                 self.stdout.write(
                     self.style.SUCCESS(f'\n✓ {message}')
                 )
-                self.stdout.write(f'\nCertificate Details:')
+                self.stdout.write('\nCertificate Details:')
                 self.stdout.write(f'  Name: {cert.name}')
                 self.stdout.write(f'  Common Name: {cert.common_name}')
                 self.stdout.write(f'  Issuer: {cert.issuer}')
@@ -84,7 +145,7 @@ class Command(BaseCommand):
                 self.stdout.write(f'  Status: {cert.status}')
                 
                 if cert.subject_alternative_names:
-                    self.stdout.write(f'\n  SANs:')
+                    self.stdout.write('\n  SANs:')
                     for san in cert.subject_alternative_names[:5]:
                         self.stdout.write(f'    - {san}')
                     if len(cert.subject_alternative_names) > 5:
@@ -92,4 +153,170 @@ class Command(BaseCommand):
             else:
                 self.stdout.write(
                     self.style.ERROR(f'\n✗ Import failed: {message}')
-                )
\ No newline at end of file
+                )
+
+    def handle_bulk(self, options):
+        """Scan every target from --targets-file and import in batches"""
+        path = options['targets_file']
+        try:
+            if path == '-':
+                targets = list(parse_targets(sys.stdin, options['port']))
+            else:
+                with open(path) as f:
+                    targets = list(parse_targets(f, options['port']))
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        
+        no_import = options['no_import']
+        update_existing = not options['no_update']
+        batch_size = max(1, options['batch_size'])
+        
+        self.stdout.write(f'Scanning {len(targets)} targets...')
+        
+        started = time.monotonic()
+        latencies = []
+        failures = Counter()
+        outcomes = Counter()
+        batch = []
+        self.chain_importer = ChainImporter()
+        
+        if options['sni_fanout']:
+            scans = self.iter_fanout(targets, options)
+        else:
+            scans = iter_scan_targets(targets, options['concurrency'])
+        
+        for target, result in scans:
+            hostname, port, name = target
+            
+            if not self.report_result(result, latencies, failures):
+                continue
+            
+            if not no_import:
+                batch.append((result, name))
+                if len(batch) >= batch_size:
+                    self.import_batch(batch, update_existing, outcomes)
+                    batch = []
+        
+        if batch:
+            self.import_batch(batch, update_existing, outcomes)
+        
+        self.write_summary(len(targets), time.monotonic() - started, latencies, failures, outcomes)
+
+    def iter_fanout(self, targets, options):
+        """Scan targets grouped by address, printing the default certificate of each"""
+        for address, port, default_result, results in iter_sni_fanout(
+            targets, options['pool_size'], options['concurrency']
+        ):
+            if address is not None:
+                if default_result['success']:
+                    default = default_result['fingerprint_sha256']
+                else:
+                    default = default_result['error']
+                self.stdout.write(f'\n{address}:{port} ({len(results)} names), default certificate: {default}')
+            yield from results
+
+    def handle_due(self, options):
+        """Scan all due scan targets and record their state"""
+        started = time.monotonic()
+        latencies = []
+        failures = Counter()
+        outcomes = Counter()
+        total = 0
+        
+        for target, result, cert, message in sweep_scan_targets(
+            limit=options['limit'],
+            concurrency=options['concurrency'],
+            update_existing=not options['no_update'],
+            import_certificates=not options['no_import'],
+        ):
+            total += 1
+            if self.report_result(result, latencies, failures) and not options['no_import']:
+                outcomes[message] += 1
+        
+        if not total:
+            self.stdout.write(self.style.SUCCESS('No scan targets are due'))
+        else:
+            self.write_summary(total, time.monotonic() - started, latencies, failures, outcomes)
+        
+        open_circuits = ScanTarget.objects.circuit_open().values(
+            'last_error_class'
+        ).annotate(count=Count('pk')).order_by('-count')
+        if open_circuits:
+            self.stdout.write(self.style.WARNING('\nTargets with open circuit (probed occasionally):'))
+            for row in open_circuits:
+                self.stdout.write(f'    - {row["last_error_class"] or "unknown"}: {row["count"]}')
+
+    def report_result(self, result, latencies, failures):
+        """Print one scan result and collect its statistics"""
+        hostname, port = result['hostname'], result['port']
+        
+        if not result['success']:
+            failures[result.get('error_class', 'unexpected')] += 1
+            self.stdout.write(
+                self.style.ERROR(f'✗ {hostname}:{port} - {result["error"]}')
+            )
+            return False
+        
+        latencies.append(result['latency'])
+        if 'is_default' in result:
+            served = 'default certificate' if result['is_default'] else result['fingerprint_sha256']
+            self.stdout.write(f'✓ {hostname}:{port} ({result["latency"] * 1000:.0f} ms) - {served}')
+        else:
+            self.stdout.write(f'✓ {hostname}:{port} ({result["latency"] * 1000:.0f} ms)')
+        return True
+
+    def import_batch(self, batch, update_existing, outcomes):
+        """Import a batch of successful scan results in one transaction"""
+        with transaction.atomic():
+            for result, name in batch:
+                try:
+                    with transaction.atomic():
+                        cert, message = import_scan_result(
+                            result, name, update_existing, self.chain_importer
+                        )
+                    outcomes[message] += 1
+                except Exception as e:
+                    outcomes['Import failed'] += 1
+                    self.stdout.write(
+                        self.style.ERROR(
+                            f'✗ Import failed for {result["hostname"]}:{result["port"]}: {str(e)}'
+                        )
+                    )
+
+    def write_summary(self, total, elapsed, latencies, failures, outcomes):
+        """Print throughput, latency and failure statistics for a bulk run"""
+        latencies.sort()
+        failed = sum(failures.values())
+        
+        self.stdout.write('\nSummary:')
+        self.stdout.write(f'  Targets: {total} ({total - failed} succeeded, {failed} failed)')
+        self.stdout.write(f'  Elapsed: {elapsed:.1f} s')
+        self.stdout.write(f'  Throughput: {total / elapsed if elapsed else 0:.1f} targets/s')
+        
+        if latencies:
+            self.stdout.write(
+                f'  Handshake latency: p50 {percentile(latencies, 50) * 1000:.0f} ms, '
+                f'p95 {percentile(latencies, 95) * 1000:.0f} ms'
+            )
+        
+        stats = scan_cache_stats()
+        dns = stats['dns']
+        self.stdout.write(
+            f'  DNS cache: {dns["hits"]} hits, {dns["misses"]} misses '
+            f'({dns["hit_rate"]:.0%} hit rate)'
+        )
+        certificates = stats['certificates']
+        self.stdout.write(
+            f'  Certificate cache: {certificates["hits"]} hits, {certificates["misses"]} misses '
+            f'({certificates["hit_rate"]:.0%} hit rate, {certificates["entries"]}/{certificates["maxsize"]} entries)'
+        )
+        
+        if failures:
+            self.stdout.write('  Failures by class:')
+            for error_class, count in failures.most_common():
+                self.stdout.write(f'    - {error_class}: {count}')
+        
+        if outcomes:
+            self.stdout.write('  Import results:')
+            for message, count in outcomes.most_common():
+                self.stdout.write(f'    - {message}: {count}')
@@ -0,0 +1,89 @@
+import time
+from django.core.management.base import BaseCommand
+from netbox_ssl_certificates.config import get_plugin_setting
+from netbox_ssl_certificates.scanner import (
+    default_worker_id,
+    sweep_scan_targets,
+)
+
+
+class Command(BaseCommand):
+    help = 'Run a scan worker that leases due scan targets from the shared queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=200,
+            help='Number of targets leased per batch (default: 200)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Number of concurrent handshakes (default: scan_concurrency setting)'
+        )
+        parser.add_argument(
+            '--lease-seconds',
+            type=int,
+            help='Lease duration; must exceed the time to scan one batch '
+                 '(default: scan_lease_seconds setting)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=int,
+            default=30,
+            help='Seconds to wait when no targets are due (default: 30)'
+        )
+        parser.add_argument(
+            '--worker-id',
+            type=str,
+            help='Lease owner name (default: hostname:pid)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once no targets are due instead of polling'
+        )
+        parser.add_argument(
+            '--no-import',
+            action='store_true',
+            help='Only record scan state without importing certificates'
+        )
+
+    def handle(self, *args, **options):
+        owner = options['worker_id'] or default_worker_id()
+        lease_seconds = options['lease_seconds'] or get_plugin_setting('scan_lease_seconds')
+        
+        self.stdout.write(f'Scan worker {owner} started')
+        
+        try:
+            while True:
+                scanned = failed = 0
+                started = time.monotonic()
+                
+                for target, result, cert, message in sweep_scan_targets(
+                    limit=options['batch_size'],
+                    concurrency=options['concurrency'],
+                    import_certificates=not options['no_import'],
+                    owner=owner,
+                    lease_seconds=lease_seconds,
+                ):
+                    scanned += 1
+                    if not result['success']:
+                        failed += 1
+                
+                if scanned:
+                    elapsed = time.monotonic() - started
+                    self.stdout.write(
+                        f'Scanned {scanned} targets ({failed} failed) in {elapsed:.1f} s'
+                    )
+                    continue
+                
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING('Interrupted; unfinished leases will expire'))
+        
+        self.stdout.write(self.style.SUCCESS(f'Scan worker {owner} stopped'))
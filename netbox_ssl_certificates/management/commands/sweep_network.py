@@ -0,0 +1,130 @@
+import ipaddress
+import time
+from collections import Counter
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from netbox_ssl_certificates.models import ScanTarget
+from netbox_ssl_certificates.scanner import ChainImporter, import_scan_result, iter_sweep_network
+
+
+class Command(BaseCommand):
+    help = 'Sweep IP networks for TLS endpoints (TCP probe first, handshake only on open ports)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'networks',
+            nargs='+',
+            help='Networks or addresses to sweep (e.g., 10.0.0.0/24 2001:db8::/120)'
+        )
+        parser.add_argument(
+            '--ports',
+            type=str,
+            default='443',
+            help='Comma-separated ports to probe (default: 443)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            help='Number of concurrent probes (default: scan_concurrency setting)'
+        )
+        parser.add_argument(
+            '--probe-timeout',
+            type=float,
+            help='TCP probe timeout in seconds (default: sweep_probe_timeout setting)'
+        )
+        parser.add_argument(
+            '--subnet-rate',
+            type=float,
+            help='Maximum probes per second per /24 or /64, 0 to disable (default: sweep_subnet_rate setting)'
+        )
+        parser.add_argument(
+            '--max-addresses',
+            type=int,
+            default=65536,
+            help='Refuse to sweep more host addresses than this (default: 65536)'
+        )
+        parser.add_argument(
+            '--create-targets',
+            action='store_true',
+            help='Add every TLS endpoint found as a scan target'
+        )
+        parser.add_argument(
+            '--import',
+            action='store_true',
+            dest='import_certificates',
+            help='Import the certificates found'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            networks = [ipaddress.ip_network(n, strict=False) for n in options['networks']]
+            ports = [int(port) for port in options['ports'].split(',') if port.strip()]
+        except ValueError as e:
+            raise CommandError(str(e))
+        
+        addresses = sum(max(1, network.num_addresses - 2) for network in networks)
+        if addresses > options['max_addresses']:
+            raise CommandError(
+                f'Sweep covers about {addresses} addresses, more than --max-addresses {options["max_addresses"]}'
+            )
+        
+        self.stdout.write(f'Sweeping {len(networks)} networks on ports {", ".join(map(str, ports))}...')
+        
+        started = time.monotonic()
+        probed = 0
+        found = []
+        failures = Counter()
+        outcomes = Counter()
+        chain_importer = ChainImporter()
+        
+        for address, port, result in iter_sweep_network(
+            networks,
+            ports,
+            concurrency=options['concurrency'],
+            probe_timeout=options['probe_timeout'],
+            subnet_rate=options['subnet_rate'],
+        ):
+            probed += 1
+            if result is None:
+                continue
+        
+            if not result['success']:
+                failures[result['error_class']] += 1
+                self.stdout.write(self.style.WARNING(f'? {address}:{port} - {result["error"]}'))
+                continue
+        
+            found.append((address, port))
+            self.stdout.write(f'✓ {address}:{port} ({result["latency"] * 1000:.0f} ms)')
+        
+            if options['import_certificates']:
+                try:
+                    cert, message = import_scan_result(result, chain_importer=chain_importer)
+                    outcomes[message] += 1
+                except Exception as e:
+                    outcomes['Import failed'] += 1
+                    self.stdout.write(self.style.ERROR(f'✗ Import failed for {address}:{port}: {str(e)}'))
+        
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'\n✓ Probed {probed} endpoints in {elapsed:.1f}s, found {len(found)} TLS endpoints'
+            )
+        )
+        for error_class, count in failures.most_common():
+            self.stdout.write(f'    - open but no TLS ({error_class}): {count}')
+        for message, count in outcomes.most_common():
+            self.stdout.write(f'    - {message}: {count}')
+        
+        if options['create_targets'] and found:
+            # ignore_conflicts skips existing targets, so count what landed
+            with transaction.atomic():
+                before = ScanTarget.objects.count()
+                ScanTarget.objects.bulk_create(
+                    [ScanTarget(hostname=address, port=port) for address, port in found],
+                    batch_size=1000,
+                    ignore_conflicts=True
+                )
+                created = ScanTarget.objects.count() - before
+            self.stdout.write(self.style.SUCCESS(
+                f'✓ Recorded {created} new scan targets ({len(found) - created} already existed)'
+            ))
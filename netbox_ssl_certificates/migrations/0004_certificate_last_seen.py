@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0003_add_advanced_features'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='last_seen',
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text='Last time the certificate was seen by a scan',
+                null=True
+            ),
+        ),
+    ]
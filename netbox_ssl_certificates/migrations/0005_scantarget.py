@@ -0,0 +1,128 @@
+from django.db import migrations, models
+import django.core.validators
+import django.db.models.deletion
+import django.utils.timezone
+import taggit.managers
+import utilities.json
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extras', '0001_initial'),
+        ('netbox_ssl_certificates', '0004_certificate_last_seen'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanTarget',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False
+                )),
+                ('created', models.DateTimeField(
+                    auto_now_add=True,
+                    null=True
+                )),
+                ('last_updated', models.DateTimeField(
+                    auto_now=True,
+                    null=True
+                )),
+                ('custom_field_data', models.JSONField(
+                    blank=True,
+                    default=dict,
+                    encoder=utilities.json.CustomFieldJSONEncoder
+                )),
+                ('hostname', models.CharField(
+                    max_length=255,
+                    help_text='Hostname or IP address to scan'
+                )),
+                ('port', models.PositiveIntegerField(
+                    default=443,
+                    help_text='SSL/TLS port',
+                    validators=[
+                        django.core.validators.MinValueValidator(1),
+                        django.core.validators.MaxValueValidator(65535)
+                    ]
+                )),
+                ('name', models.CharField(
+                    max_length=200,
+                    blank=True,
+                    help_text='Certificate name to import as (default: hostname:port)'
+                )),
+                ('certificate', models.ForeignKey(
+                    blank=True,
+                    editable=False,
+                    help_text='Certificate last imported from this endpoint',
+                    null=True,
+                    on_delete=django.db.models.deletion.SET_NULL,
+                    related_name='scan_targets',
+                    to='netbox_ssl_certificates.certificate'
+                )),
+                ('enabled', models.BooleanField(
+                    default=True,
+                    help_text='Include this endpoint in scheduled scans'
+                )),
+                ('description', models.CharField(
+                    max_length=200,
+                    blank=True
+                )),
+                ('next_scan_at', models.DateTimeField(
+                    db_index=True,
+                    default=django.utils.timezone.now,
+                    help_text='Time of the next scheduled scan'
+                )),
+                ('last_scanned', models.DateTimeField(
+                    blank=True,
+                    db_index=True,
+                    editable=False,
+                    null=True
+                )),
+                ('last_fingerprint', models.CharField(
+                    max_length=95,
+                    blank=True,
+                    db_index=True,
+                    editable=False,
+                    help_text='SHA-256 fingerprint seen by the last successful scan'
+                )),
+                ('last_error', models.TextField(
+                    blank=True,
+                    editable=False
+                )),
+                ('consecutive_failures', models.PositiveIntegerField(
+                    db_index=True,
+                    default=0,
+                    editable=False
+                )),
+                ('comments', models.TextField(
+                    blank=True
+                )),
+                ('tags', taggit.managers.TaggableManager(
+                    through='extras.TaggedItem',
+                    to='extras.Tag',
+                    blank=True
+                )),
+            ],
+            options={
+                'verbose_name': 'Scan Target',
+                'verbose_name_plural': 'Scan Targets',
+                'ordering': ['hostname', 'port'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scantarget',
+            constraint=models.UniqueConstraint(
+                fields=('hostname', 'port'),
+                name='netbox_ssl_scantarget_unique_endpoint'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='scantarget',
+            index=models.Index(
+                fields=['enabled', 'next_scan_at'],
+                name='netbox_ssl_target_due_idx'
+            ),
+        ),
+    ]
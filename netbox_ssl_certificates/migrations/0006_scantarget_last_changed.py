@@ -0,0 +1,21 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0005_scantarget'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scantarget',
+            name='last_changed',
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text='Last time a scan saw a different certificate than before',
+                null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0006_scantarget_last_changed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scantarget',
+            name='last_error_class',
+            field=models.CharField(
+                blank=True,
+                choices=[
+                    ('timeout', 'Timeout'),
+                    ('dns', 'DNS resolution'),
+                    ('connection', 'Connection refused/reset'),
+                    ('ssl', 'SSL error'),
+                    ('unexpected', 'Unexpected error'),
+                ],
+                db_index=True,
+                editable=False,
+                help_text='Class of the last scan failure',
+                max_length=20
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0007_scantarget_last_error_class'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scantarget',
+            name='lease_owner',
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                max_length=100
+            ),
+        ),
+        migrations.AddField(
+            model_name='scantarget',
+            name='lease_expires',
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                null=True
+            ),
+        ),
+    ]
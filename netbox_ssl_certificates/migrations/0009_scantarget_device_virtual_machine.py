@@ -0,0 +1,38 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0008_scantarget_lease'),
+        ('dcim', '0001_initial'),
+        ('virtualization', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scantarget',
+            name='device',
+            field=models.ForeignKey(
+                blank=True,
+                help_text='Device serving this endpoint',
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='certificate_scan_targets',
+                to='dcim.device'
+            ),
+        ),
+        migrations.AddField(
+            model_name='scantarget',
+            name='virtual_machine',
+            field=models.ForeignKey(
+                blank=True,
+                help_text='Virtual machine serving this endpoint',
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='certificate_scan_targets',
+                to='virtualization.virtualmachine'
+            ),
+        ),
+    ]
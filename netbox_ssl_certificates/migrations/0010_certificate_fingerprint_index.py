@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0009_scantarget_device_virtual_machine'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='certificate',
+            name='fingerprint_sha256',
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text='SHA-256 fingerprint',
+                max_length=95
+            ),
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0010_certificate_fingerprint_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanResult',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False
+                )),
+                ('timestamp', models.DateTimeField(
+                    db_index=True,
+                    default=django.utils.timezone.now
+                )),
+                ('fingerprint', models.CharField(
+                    blank=True,
+                    max_length=95
+                )),
+                ('protocol', models.CharField(
+                    blank=True,
+                    max_length=16
+                )),
+                ('cipher', models.CharField(
+                    blank=True,
+                    max_length=100
+                )),
+                ('latency', models.FloatField(
+                    blank=True,
+                    help_text='Connect and handshake time in seconds',
+                    null=True
+                )),
+                ('error_class', models.CharField(
+                    blank=True,
+                    choices=[
+                        ('timeout', 'Timeout'),
+                        ('dns', 'DNS resolution'),
+                        ('connection', 'Connection refused/reset'),
+                        ('ssl', 'SSL error'),
+                        ('unexpected', 'Unexpected error')
+                    ],
+                    max_length=20
+                )),
+                ('target', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='scan_results',
+                    to='netbox_ssl_certificates.scantarget'
+                )),
+            ],
+            options={
+                'verbose_name': 'Scan Result',
+                'verbose_name_plural': 'Scan Results',
+                'ordering': ['-timestamp'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='scanresult',
+            index=models.Index(
+                fields=['target', '-timestamp'],
+                name='netbox_ssl_result_target_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0011_scanresult'),
+    ]
+
+    operations = [
+        # Expiry status is now derived from valid_until at query time
+        migrations.RemoveIndex(
+            model_name='certificate',
+            name='netbox_ssl_cert_expired_idx',
+        ),
+        migrations.RemoveField(
+            model_name='certificate',
+            name='is_expired',
+        ),
+        migrations.RemoveField(
+            model_name='certificate',
+            name='days_until_expiry',
+        ),
+    ]
@@ -0,0 +1,53 @@
+from cryptography import x509
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+
+
+def populate_certificate_der(apps, schema_editor):
+    """Fill certificate_der from the PEM of existing certificates"""
+    Certificate = apps.get_model('netbox_ssl_certificates', 'Certificate')
+    db_alias = schema_editor.connection.alias
+    last_pk = 0
+    
+    while True:
+        chunk = list(
+            Certificate.objects.using(db_alias).filter(
+                pk__gt=last_pk, certificate_der__isnull=True
+            ).only('pk', 'certificate_file').order_by('pk')[:BATCH_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        
+        changed = []
+        for cert in chunk:
+            try:
+                parsed = x509.load_pem_x509_certificate(
+                    cert.certificate_file.encode('utf-8'), default_backend()
+                )
+            except Exception:
+                # Left empty; filled in on the next save or refresh
+                continue
+            cert.certificate_der = parsed.public_bytes(serialization.Encoding.DER)
+            changed.append(cert)
+        
+        Certificate.objects.using(db_alias).bulk_update(changed, ['certificate_der'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0012_remove_certificate_expiry_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='certificate_der',
+            field=models.BinaryField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(populate_certificate_der, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,106 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def populate_certificate_names(apps, schema_editor):
+    """Create name rows from the CN and SANs of existing certificates"""
+    from netbox_ssl_certificates.utils import certificate_names, reverse_hostname
+    
+    Certificate = apps.get_model('netbox_ssl_certificates', 'Certificate')
+    CertificateName = apps.get_model('netbox_ssl_certificates', 'CertificateName')
+    db_alias = schema_editor.connection.alias
+    last_pk = 0
+    
+    while True:
+        chunk = list(
+            Certificate.objects.using(db_alias).filter(pk__gt=last_pk).only(
+                'pk', 'common_name', 'subject_alternative_names'
+            ).order_by('pk')[:BATCH_SIZE]
+        )
+        if not chunk:
+            break
+        last_pk = chunk[-1].pk
+        
+        rows = []
+        for cert in chunk:
+            for name, source in certificate_names(cert.common_name, cert.subject_alternative_names):
+                is_wildcard = name.startswith('*.')
+                rows.append(CertificateName(
+                    certificate_id=cert.pk,
+                    name=name,
+                    reversed_name=reverse_hostname(name),
+                    wildcard_base=name[2:] if is_wildcard else '',
+                    is_wildcard=is_wildcard,
+                    source=source,
+                ))
+        CertificateName.objects.using(db_alias).bulk_create(rows, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('netbox_ssl_certificates', '0013_certificate_der'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateName',
+            fields=[
+                ('id', models.BigAutoField(
+                    auto_created=True,
+                    primary_key=True,
+                    serialize=False
+                )),
+                ('name', models.CharField(
+                    db_index=True,
+                    max_length=255
+                )),
+                ('reversed_name', models.CharField(
+                    max_length=255
+                )),
+                ('wildcard_base', models.CharField(
+                    blank=True,
+                    db_index=True,
+                    max_length=255
+                )),
+                ('is_wildcard', models.BooleanField(
+                    default=False
+                )),
+                ('source', models.CharField(
+                    choices=[
+                        ('cn', 'Common name'),
+                        ('san', 'Subject alternative name')
+                    ],
+                    max_length=10
+                )),
+                ('certificate', models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='names',
+                    to='netbox_ssl_certificates.certificate'
+                )),
+            ],
+            options={
+                'verbose_name': 'Certificate Name',
+                'verbose_name_plural': 'Certificate Names',
+                'ordering': ['certificate', 'name'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='certificatename',
+            constraint=models.UniqueConstraint(
+                fields=['certificate', 'name'],
+                name='netbox_ssl_certname_unique'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='certificatename',
+            index=models.Index(
+                fields=['reversed_name'],
+                name='netbox_ssl_certname_rev_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+        ),
+        migrations.RunPython(populate_certificate_names, migrations.RunPython.noop),
+    ]
@@ -1,12 +1,30 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, transaction
+from django.db.models import (
+    DEFERRED, Case, CharField, Count, DurationField, ExpressionWrapper, F, FloatField, IntegerField, Q,
+    Value, When,
+)
+from django.db.models.functions import Cast, Extract, Floor, Now
 from django.urls import reverse
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.utils import timezone as django_timezone
 from netbox.models import NetBoxModel
+from utilities.querysets import RestrictedQuerySet
+from .scheduler import circuit_threshold
+from .utils import (
+    MAX_HOSTNAME_LENGTH,
+    certificate_cache,
+    certificate_names,
+    normalize_hostname,
+    parse_certificate_metadata,
+    pem_to_der,
+    reverse_hostname,
+)
 from dcim.models import Device, Site
 from virtualization.models import VirtualMachine
-from cryptography import x509
 from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.exceptions import InvalidSignature
 from datetime import datetime, timezone
@@ -19,10 +37,7 @@ def validate_certificate_matches_key(certificate_file, private_key):
     
     try:
         # Load certificate
-        cert = x509.load_pem_x509_certificate(
-            certificate_file.encode('utf-8'),
-            default_backend()
-        )
+        cert = certificate_cache.load_pem(certificate_file)
         
         # Load private key
         key = serialization.load_pem_private_key(
@@ -53,6 +68,116 @@ def validate_certificate_matches_key(certificate_file, private_key):
         raise ValidationError(f'Validation error: {str(e)}')
 
 
+# Certificates expiring within this many days are reported as expiring soon
+EXPIRING_SOON_DAYS = 30
+
+# Fields derived from the PEM by parse_certificate_metadata()
+METADATA_FIELDS = (
+    'common_name', 'issuer', 'subject_alternative_names', 'serial_number',
+    'valid_from', 'valid_until', 'fingerprint_sha256', 'is_self_signed',
+    'key_size', 'algorithm',
+)
+
+
+# Large columns only needed on detail, edit and export pages
+CONTENT_FIELDS = (
+    'certificate_file',
+    'certificate_der',
+    'private_key',
+    'chain_verification_message',
+    'comments',
+)
+
+
+def expiry_q(min_days=0, max_days=None, now=None):
+    """Q matching certificates with days_until_expiry in [min_days, max_days]
+
+    Days are whole days left, as in Certificate.days_until_expiry, so the
+    conditions compare valid_until directly and can use its index.
+    """
+    if now is None:
+        now = django_timezone.now()
+    q = Q(valid_until__gte=now + timedelta(days=min_days))
+    if max_days is not None:
+        q &= Q(valid_until__lt=now + timedelta(days=max_days + 1))
+    return q
+
+
+class CertificateQuerySet(RestrictedQuerySet):
+    """QuerySet for certificates
+
+    Expiry status is derived from valid_until at query time, so rows never
+    need to be resaved as time passes.
+    """
+    
+    def without_content(self):
+        """Defer the PEM, DER, key and free-text columns list pages never render"""
+        return self.defer(*CONTENT_FIELDS)
+    
+    def with_expiry(self):
+        """Annotate expiry_days and expiry_status computed by the database
+
+        expiry_days is floored like Certificate.days_until_expiry, so a
+        certificate that expired two hours ago is at -1 days, not 0.
+        """
+        remaining = ExpressionWrapper(F('valid_until') - Now(), output_field=DurationField())
+        seconds = ExpressionWrapper(Extract(remaining, 'epoch'), output_field=FloatField())
+        soon = ExpressionWrapper(
+            Now() + timedelta(days=EXPIRING_SOON_DAYS + 1),
+            output_field=models.DateTimeField()
+        )
+        return self.annotate(
+            expiry_days=Cast(Floor(seconds / Value(86400.0)), IntegerField()),
+            expiry_status=Case(
+                When(valid_until__lt=Now(), then=Value('expired')),
+                When(valid_until__lt=soon, then=Value('expiring_soon')),
+                default=Value('valid'),
+                output_field=CharField(),
+            ),
+        )
+    
+    def expired(self, now=None):
+        """Certificates past their valid_until"""
+        if now is None:
+            now = django_timezone.now()
+        return self.filter(valid_until__lt=now)
+    
+    def not_expired(self, now=None):
+        """Certificates not past their valid_until, including unknown expiry"""
+        if now is None:
+            now = django_timezone.now()
+        return self.exclude(valid_until__lt=now)
+    
+    def expiring_between(self, min_days=0, max_days=None, now=None):
+        """Certificates with days_until_expiry between min_days and max_days"""
+        return self.filter(expiry_q(min_days, max_days, now))
+    
+    def expiring_within(self, days=EXPIRING_SOON_DAYS, now=None):
+        """Certificates that are not expired and expire within `days` days"""
+        return self.expiring_between(0, days, now)
+    
+    def valid(self, now=None):
+        """Certificates that are neither expired nor expiring soon"""
+        if now is None:
+            now = django_timezone.now()
+        return self.exclude(valid_until__lt=now + timedelta(days=EXPIRING_SOON_DAYS + 1))
+    
+    def expiry_summary(self, now=None):
+        """Count certificates per expiry bucket in a single query"""
+        if now is None:
+            now = django_timezone.now()
+        soon = now + timedelta(days=EXPIRING_SOON_DAYS + 1)
+        return self.aggregate(
+            total=Count('pk'),
+            expired=Count('pk', filter=Q(valid_until__lt=now)),
+            expiring_soon=Count('pk', filter=expiry_q(0, EXPIRING_SOON_DAYS, now)),
+            valid=Count('pk', filter=Q(valid_until__gte=soon) | Q(valid_until__isnull=True)),
+            expiring_7_days=Count('pk', filter=expiry_q(0, 7, now)),
+            expiring_30_days=Count('pk', filter=expiry_q(8, 30, now)),
+            expiring_90_days=Count('pk', filter=expiry_q(31, 90, now)),
+        )
+
+
 class Certificate(NetBoxModel):
     """Model for SSL/TLS certificates"""
     
@@ -68,6 +193,13 @@ class Certificate(NetBoxModel):
     certificate_file = models.TextField(
         help_text='PEM encoded certificate content'
     )
+    # DER encoding of certificate_file, maintained on save so parsing skips
+    # the PEM decoding; certificate_file stays the stored form
+    certificate_der = models.BinaryField(
+        null=True,
+        blank=True,
+        editable=False
+    )
     private_key = models.TextField(
         blank=True,
         help_text='PEM encoded private key (optional)'
@@ -128,18 +260,12 @@ class Certificate(NetBoxModel):
         max_length=95,
         blank=True,
         editable=False,
+        db_index=True,
         help_text='SHA-256 fingerprint'
     )
     is_self_signed = models.BooleanField(default=False, editable=False)
     key_size = models.IntegerField(null=True, blank=True, editable=False)
     algorithm = models.CharField(max_length=50, blank=True, editable=False)
-    is_expired = models.BooleanField(
-        default=False,
-        editable=False,
-        db_index=True
-    )
-    days_until_expiry = models.IntegerField(null=True, blank=True, editable=False)
-    
     # Chain verification status
     chain_verified = models.BooleanField(
         default=False,
@@ -152,7 +278,17 @@ class Certificate(NetBoxModel):
         help_text='Chain verification details'
     )
     
+    # Last time a scan saw this certificate served by an endpoint
+    last_seen = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Last time the certificate was seen by a scan'
+    )
+    
     comments = models.TextField(blank=True)
+    
+    objects = CertificateQuerySet.as_manager()
 
     class Meta:
         ordering = ['name']
@@ -165,12 +301,31 @@ class Certificate(NetBoxModel):
     def get_absolute_url(self):
         return reverse('plugins:netbox_ssl_certificates:certificate', args=[self.pk])
 
+    @property
+    def is_expired(self):
+        """Whether the certificate is past its valid_until"""
+        return self.valid_until is not None and datetime.now(timezone.utc) > self.valid_until
+
+    @property
+    def days_until_expiry(self):
+        """Whole days left until expiry, negative once expired
+
+        Uses the expiry_days annotation of with_expiry() when present.
+        """
+        if 'expiry_days' in self.__dict__:
+            return self.expiry_days
+        if self.valid_until is None:
+            return None
+        return (self.valid_until - datetime.now(timezone.utc)).days
+
     @property
     def status(self):
         """Return certificate status"""
+        if 'expiry_status' in self.__dict__:
+            return self.expiry_status
         if self.is_expired:
             return 'expired'
-        elif self.days_until_expiry is not None and self.days_until_expiry <= 30:
+        elif self.days_until_expiry is not None and self.days_until_expiry <= EXPIRING_SOON_DAYS:
             return 'expiring_soon'
         return 'valid'
 
@@ -203,78 +358,75 @@ class Certificate(NetBoxModel):
                 self.private_key
             )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        
+        # The stored metadata was derived from the stored PEM and CA
+        loaded = dict(zip(field_names, values))
+        instance._parsed_pem = loaded.get('certificate_file', DEFERRED)
+        instance._verified_ca_id = loaded.get('ca_certificate_id', DEFERRED)
+        return instance
+
+    def _pem_changed(self):
+        """Whether the PEM differs from the one the metadata was parsed from"""
+        deferred = self.get_deferred_fields()
+        if 'certificate_file' in deferred:
+            return False
+        if self.certificate_file != getattr(self, '_parsed_pem', None):
+            return True
+        if 'certificate_der' not in deferred and not self.certificate_der:
+            return True
+        return 'fingerprint_sha256' not in deferred and not self.fingerprint_sha256
+
+    def _ca_changed(self):
+        """Whether the CA differs from the one the chain was verified against"""
+        if 'ca_certificate_id' in self.get_deferred_fields():
+            return False
+        return self.ca_certificate_id != getattr(self, '_verified_ca_id', DEFERRED)
+
     def save(self, *args, **kwargs):
-        """Parse certificate on save"""
-        if self.certificate_file:
+        """Parse certificate on save
+
+        Parsing and chain verification only run when the PEM or the CA
+        changed, so saving comments, tags or other fields does no crypto
+        work.
+        """
+        adding = self._state.adding
+        pem_changed = bool(self.certificate_file) and self._pem_changed()
+        if pem_changed:
             self._parse_certificate()
         
         # Verify chain if CA certificate is set
-        if self.ca_certificate:
+        if self.ca_certificate_id and (pem_changed or self._ca_changed()):
             self._verify_chain()
         
         super().save(*args, **kwargs)
+        
+        # New certificates may have been parsed before save() (see ChainImporter)
+        if adding or pem_changed:
+            sync_certificate_names([self])
+        
+        if 'certificate_file' not in self.get_deferred_fields():
+            self._parsed_pem = self.certificate_file
+        if 'ca_certificate_id' not in self.get_deferred_fields():
+            self._verified_ca_id = self.ca_certificate_id
 
     def _parse_certificate(self):
         """Parse certificate and extract metadata"""
-        try:
-            cert_bytes = self.certificate_file.encode('utf-8')
-            cert = x509.load_pem_x509_certificate(cert_bytes, default_backend())
-            
-            # Extract common name
-            try:
-                self.common_name = cert.subject.get_attributes_for_oid(
-                    x509.oid.NameOID.COMMON_NAME
-                )[0].value
-            except (IndexError, AttributeError):
-                self.common_name = 'N/A'
-            
-            # Extract issuer
-            try:
-                self.issuer = cert.issuer.get_attributes_for_oid(
-                    x509.oid.NameOID.COMMON_NAME
-                )[0].value
-            except (IndexError, AttributeError):
-                self.issuer = 'N/A'
-            
-            # Extract SANs
-            try:
-                san_ext = cert.extensions.get_extension_for_oid(
-                    x509.oid.ExtensionOID.SUBJECT_ALTERNATIVE_NAME
-                )
-                self.subject_alternative_names = [
-                    str(name.value) for name in san_ext.value
-                ]
-            except x509.ExtensionNotFound:
-                self.subject_alternative_names = []
-            
-            # Serial number
-            self.serial_number = format(cert.serial_number, 'X')
-            
-            # Validity dates
-            self.valid_from = cert.not_valid_before_utc
-            self.valid_until = cert.not_valid_after_utc
-            
-            # Calculate expiry
-            now = datetime.now(timezone.utc)
-            self.is_expired = now > self.valid_until
-            self.days_until_expiry = (self.valid_until - now).days
-            
-            # Fingerprint
-            fingerprint = cert.fingerprint(hashes.SHA256())
-            self.fingerprint_sha256 = ':'.join(
-                format(b, '02X') for b in fingerprint
-            )
-            
-            # Check if self-signed
-            self.is_self_signed = cert.issuer == cert.subject
-            
-            # Key size and algorithm
-            public_key = cert.public_key()
-            self.key_size = public_key.key_size
-            self.algorithm = cert.signature_algorithm_oid._name
-            
-        except Exception as e:
-            raise ValueError(f'Failed to parse certificate: {str(e)}')
+        for field, value in parse_certificate_metadata(self.certificate_file).items():
+            setattr(self, field, value)
+        self.certificate_der = pem_to_der(self.certificate_file)
+        self._parsed_pem = self.certificate_file
+        # Annotations from with_expiry() describe the previous certificate
+        self.__dict__.pop('expiry_days', None)
+        self.__dict__.pop('expiry_status', None)
+
+    def load_certificate(self):
+        """Return the parsed certificate, from DER when it is stored"""
+        if 'certificate_der' not in self.get_deferred_fields() and self.certificate_der:
+            return certificate_cache.load_der(bytes(self.certificate_der))
+        return certificate_cache.load_pem(self.certificate_file)
 
     def _verify_chain(self):
         """Verify certificate chain with CA certificate"""
@@ -284,11 +436,8 @@ class Certificate(NetBoxModel):
             return
         
         try:
-            cert_bytes = self.certificate_file.encode('utf-8')
-            cert = x509.load_pem_x509_certificate(cert_bytes, default_backend())
-            
-            ca_bytes = self.ca_certificate.certificate_file.encode('utf-8')
-            ca_cert = x509.load_pem_x509_certificate(ca_bytes, default_backend())
+            cert = self.load_certificate()
+            ca_cert = self.ca_certificate.load_certificate()
             
             # Verify signature
             try:
@@ -316,4 +465,374 @@ class Certificate(NetBoxModel):
         """Public method to verify chain and save"""
         self._verify_chain()
         self.save()
-        return self.chain_verified, self.chain_verification_message
\ No newline at end of file
+        return self.chain_verified, self.chain_verification_message
+
+
+# Failure classes reported by the scanner
+SCAN_ERROR_CLASS_CHOICES = [
+    ('timeout', 'Timeout'),
+    ('dns', 'DNS resolution'),
+    ('connection', 'Connection refused/reset'),
+    ('ssl', 'SSL error'),
+    ('unexpected', 'Unexpected error'),
+]
+
+
+class ScanTargetQuerySet(RestrictedQuerySet):
+    """QuerySet for scan targets"""
+    
+    def due(self, now=None):
+        """Enabled targets whose next scan time has passed, most overdue first"""
+        if now is None:
+            now = django_timezone.now()
+        return self.filter(
+            enabled=True,
+            next_scan_at__lte=now
+        ).order_by('next_scan_at')
+    
+    def circuit_open(self):
+        """Targets failing often enough to only be probed occasionally"""
+        return self.filter(consecutive_failures__gte=circuit_threshold())
+    
+    def lease_due(self, owner, fields, limit=None, lease_seconds=600, now=None):
+        """Claim due targets for a scan worker and return them as named rows
+
+        Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+        workers on any node never claim the same target. Targets whose lease
+        has expired (e.g. their worker died) are claimed again.
+        """
+        if now is None:
+            now = django_timezone.now()
+        
+        with transaction.atomic():
+            rows = self.due(now).filter(
+                models.Q(lease_expires__isnull=True) | models.Q(lease_expires__lt=now)
+            ).select_for_update(skip_locked=True).values_list(*fields, named=True)
+            if limit:
+                rows = rows[:limit]
+            rows = list(rows)
+            
+            self.filter(pk__in=[row.pk for row in rows]).update(
+                lease_owner=owner,
+                lease_expires=now + timedelta(seconds=lease_seconds)
+            )
+        
+        return rows
+
+
+class ScanTarget(NetBoxModel):
+    """An endpoint (host:port) monitored by periodic certificate scans"""
+    
+    hostname = models.CharField(
+        max_length=255,
+        help_text='Hostname or IP address to scan'
+    )
+    port = models.PositiveIntegerField(
+        default=443,
+        validators=[MinValueValidator(1), MaxValueValidator(65535)],
+        help_text='SSL/TLS port'
+    )
+    name = models.CharField(
+        max_length=200,
+        blank=True,
+        help_text='Certificate name to import as (default: hostname:port)'
+    )
+    certificate = models.ForeignKey(
+        to=Certificate,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='scan_targets',
+        editable=False,
+        help_text='Certificate last imported from this endpoint'
+    )
+    device = models.ForeignKey(
+        to='dcim.Device',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='certificate_scan_targets',
+        help_text='Device serving this endpoint'
+    )
+    virtual_machine = models.ForeignKey(
+        to='virtualization.VirtualMachine',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='certificate_scan_targets',
+        help_text='Virtual machine serving this endpoint'
+    )
+    enabled = models.BooleanField(
+        default=True,
+        help_text='Include this endpoint in scheduled scans'
+    )
+    description = models.CharField(
+        max_length=200,
+        blank=True
+    )
+    
+    # Scan state, maintained by the scanner
+    next_scan_at = models.DateTimeField(
+        default=django_timezone.now,
+        db_index=True,
+        help_text='Time of the next scheduled scan'
+    )
+    last_scanned = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+    last_fingerprint = models.CharField(
+        max_length=95,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text='SHA-256 fingerprint seen by the last successful scan'
+    )
+    last_changed = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text='Last time a scan saw a different certificate than before'
+    )
+    last_error = models.TextField(
+        blank=True,
+        editable=False
+    )
+    last_error_class = models.CharField(
+        max_length=20,
+        blank=True,
+        editable=False,
+        db_index=True,
+        choices=SCAN_ERROR_CLASS_CHOICES,
+        help_text='Class of the last scan failure'
+    )
+    consecutive_failures = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        db_index=True
+    )
+    
+    # Work queue lease held by the worker currently scanning the target
+    lease_owner = models.CharField(
+        max_length=100,
+        blank=True,
+        editable=False
+    )
+    lease_expires = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True
+    )
+    
+    comments = models.TextField(blank=True)
+    
+    objects = ScanTargetQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['hostname', 'port']
+        verbose_name = 'Scan Target'
+        verbose_name_plural = 'Scan Targets'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hostname', 'port'],
+                name='netbox_ssl_scantarget_unique_endpoint'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['enabled', 'next_scan_at'],
+                name='netbox_ssl_target_due_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.hostname}:{self.port}'
+
+    def get_absolute_url(self):
+        return reverse('plugins:netbox_ssl_certificates:scantarget', args=[self.pk])
+
+    @property
+    def circuit_open(self):
+        """Whether the endpoint failed too often and is only probed occasionally"""
+        return self.consecutive_failures >= circuit_threshold()
+
+    @property
+    def certificate_name(self):
+        """Name under which the endpoint's certificate is imported"""
+        return self.name or f'{self.hostname}:{self.port}'
+
+
+class ScanResult(models.Model):
+    """One scan of a ScanTarget, kept for trend reporting
+
+    Written in bulk by sweeps and pruned by prune_scan_history, so it is a
+    plain model without change logging, tags or custom fields.
+    """
+    
+    target = models.ForeignKey(
+        to=ScanTarget,
+        on_delete=models.CASCADE,
+        related_name='scan_results'
+    )
+    timestamp = models.DateTimeField(
+        default=django_timezone.now,
+        db_index=True
+    )
+    fingerprint = models.CharField(
+        max_length=95,
+        blank=True
+    )
+    protocol = models.CharField(
+        max_length=16,
+        blank=True
+    )
+    cipher = models.CharField(
+        max_length=100,
+        blank=True
+    )
+    latency = models.FloatField(
+        null=True,
+        blank=True,
+        help_text='Connect and handshake time in seconds'
+    )
+    error_class = models.CharField(
+        max_length=20,
+        blank=True,
+        choices=SCAN_ERROR_CLASS_CHOICES
+    )
+
+    class Meta:
+        ordering = ['-timestamp']
+        verbose_name = 'Scan Result'
+        verbose_name_plural = 'Scan Results'
+        indexes = [
+            models.Index(
+                fields=['target', '-timestamp'],
+                name='netbox_ssl_result_target_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.target_id} @ {self.timestamp}'
+
+    @property
+    def success(self):
+        """Whether the scan retrieved a certificate"""
+        return not self.error_class
+
+
+CERTIFICATE_NAME_SOURCE_CHOICES = [
+    ('cn', 'Common name'),
+    ('san', 'Subject alternative name'),
+]
+
+
+class CertificateName(models.Model):
+    """One normalized CN or SAN of a Certificate, indexed for hostname lookups
+
+    Rebuilt by sync_certificate_names() whenever the certificate is parsed.
+    reversed_name holds the labels in reverse order so a domain suffix
+    becomes an indexable prefix, and wildcard_base holds the parent
+    domain of a wildcard name (example.com for *.example.com).
+    """
+    
+    certificate = models.ForeignKey(
+        to=Certificate,
+        on_delete=models.CASCADE,
+        related_name='names'
+    )
+    name = models.CharField(
+        max_length=MAX_HOSTNAME_LENGTH,
+        db_index=True
+    )
+    reversed_name = models.CharField(
+        max_length=MAX_HOSTNAME_LENGTH
+    )
+    wildcard_base = models.CharField(
+        max_length=MAX_HOSTNAME_LENGTH,
+        blank=True,
+        db_index=True
+    )
+    is_wildcard = models.BooleanField(
+        default=False
+    )
+    source = models.CharField(
+        max_length=10,
+        choices=CERTIFICATE_NAME_SOURCE_CHOICES
+    )
+
+    class Meta:
+        ordering = ['certificate', 'name']
+        verbose_name = 'Certificate Name'
+        verbose_name_plural = 'Certificate Names'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['certificate', 'name'],
+                name='netbox_ssl_certname_unique'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['reversed_name'],
+                name='netbox_ssl_certname_rev_idx',
+                opclasses=['varchar_pattern_ops']
+            ),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def for_certificate(cls, certificate):
+        """Build the unsaved name rows of a certificate from its CN and SANs"""
+        rows = []
+        for name, source in certificate_names(
+            certificate.common_name, certificate.subject_alternative_names
+        ):
+            is_wildcard = name.startswith('*.')
+            rows.append(cls(
+                certificate_id=certificate.pk,
+                name=name,
+                reversed_name=reverse_hostname(name),
+                wildcard_base=name[2:] if is_wildcard else '',
+                is_wildcard=is_wildcard,
+                source=source,
+            ))
+        return rows
+
+
+def sync_certificate_names(certificates):
+    """Replace the CertificateName rows of the given saved certificates"""
+    certificates = [cert for cert in certificates if cert.pk]
+    if not certificates:
+        return
+    with transaction.atomic():
+        CertificateName.objects.filter(
+            certificate_id__in=[cert.pk for cert in certificates]
+        ).delete()
+        CertificateName.objects.bulk_create(
+            [row for cert in certificates for row in CertificateName.for_certificate(cert)],
+            batch_size=1000
+        )
+
+
+def hostname_q(hostname):
+    """Q over CertificateName matching names that cover hostname
+
+    A wildcard covers exactly one label: *.example.com matches
+    api.example.com but neither example.com nor a.b.example.com.
+    """
+    hostname = normalize_hostname(hostname)
+    q = Q(name=hostname)
+    if '.' in hostname:
+        q |= Q(is_wildcard=True, wildcard_base=hostname.split('.', 1)[1])
+    return q
+
+
+def hostname_suffix_q(suffix):
+    """Q over CertificateName matching names equal to or under a domain suffix"""
+    reversed_suffix = reverse_hostname(normalize_hostname(suffix).lstrip('.'))
+    return Q(reversed_name=reversed_suffix) | Q(reversed_name__startswith=f'{reversed_suffix}.')
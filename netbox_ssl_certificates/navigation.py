@@ -35,6 +35,22 @@ menu = PluginMenu(
                             title="Scan",
                             icon_class="mdi mdi-magnify",
                         ),
+                        PluginMenuButton(
+                            link="plugins:netbox_ssl_certificates:certificate_bulk_scan",
+                            title="Bulk Scan",
+                            icon_class="mdi mdi-radar",
+                        ),
+                    ),
+                ),
+                PluginMenuItem(
+                    link="plugins:netbox_ssl_certificates:scantarget_list",
+                    link_text="Scan Targets",
+                    buttons=(
+                        PluginMenuButton(
+                            link="plugins:netbox_ssl_certificates:scantarget_add",
+                            title="Add",
+                            icon_class="mdi mdi-plus-thick",
+                        ),
                     ),
                 ),
             ),
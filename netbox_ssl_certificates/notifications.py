@@ -62,13 +62,9 @@ def send_expiry_notification(certificates, days_threshold=30):
 
 def get_expiring_certificates(days=30):
     """Get certificates expiring within specified days"""
-    return Certificate.objects.filter(
-        is_expired=False,
-        days_until_expiry__lte=days,
-        days_until_expiry__gte=0
-    ).order_by('valid_until')
+    return Certificate.objects.without_content().expiring_within(days).order_by('valid_until')
 
 
 def get_expired_certificates():
     """Get expired certificates"""
-    return Certificate.objects.filter(is_expired=True).order_by('-valid_until')
\ No newline at end of file
+    return Certificate.objects.without_content().expired().order_by('-valid_until')
\ No newline at end of file
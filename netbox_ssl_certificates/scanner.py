@@ -1,146 +1,1258 @@
+import os
 import ssl
+import _ssl
 import socket
-from datetime import datetime, timezone
-from cryptography import x509
-from cryptography.hazmat.backends import default_backend
-from cryptography.hazmat.primitives import serialization
-from .models import Certificate
+import asyncio
+import contextvars
+import ipaddress
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from cryptography.hazmat.primitives import hashes, serialization
+from .config import get_plugin_setting
+from .discovery import link_certificates
+from .models import Certificate, ScanResult, ScanTarget
+from .utils import certificate_cache, format_fingerprint
+from .scheduler import failure_backoff, next_scan_time
 import logging
 
 logger = logging.getLogger('netbox.plugins.netbox_ssl_certificates')
 
+# ScanTarget columns loaded for a sweep; the first two feed the scan engine
+SWEEP_FIELDS = (
+    'hostname', 'port', 'name', 'pk', 'last_fingerprint', 'last_changed',
+    'consecutive_failures', 'device_id', 'virtual_machine_id',
+)
+
+# Marks the end of a concurrent scan run
+_DONE = object()
+
+# Concurrency slots of the _iter_concurrently() run the current task belongs
+# to, handed back while the task waits for a rate limit
+_scan_slots = contextvars.ContextVar('scan_slots', default=None)
+
+# Items of a concurrent scan run that may wait for a rate limit without
+# holding a slot, as a multiple of the concurrency
+THROTTLED_BACKLOG = 10
+
+
+class DNSCache:
+    """TTL-bound cache of resolved addresses shared by all scans
+
+    Entries map a hostname to the list of IP addresses returned by
+    getaddrinfo(). Concurrent async lookups of the same hostname share one
+    resolution. Hit and miss counters are kept to size the TTL.
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+    
+    def _lookup(self, hostname):
+        with self._lock:
+            entry = self._entries.get(hostname)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+            return None
+    
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+    
+    def _store(self, hostname, addrinfo):
+        addresses = list(dict.fromkeys(info[4][0] for info in addrinfo))
+        with self._lock:
+            self._entries[hostname] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+    
+    def resolve(self, hostname, port):
+        """Return the addresses for hostname, resolving on a cache miss"""
+        addresses = self._lookup(hostname)
+        self._count(addresses is not None)
+        if addresses is None:
+            addresses = self._store(
+                hostname, socket.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+            )
+        return addresses
+    
+    async def async_resolve(self, hostname, port):
+        """Resolve hostname on the running loop, sharing in-flight lookups"""
+        addresses = self._lookup(hostname)
+        pending = self._pending.get(hostname)
+        self._count(addresses is not None or pending is not None)
+        
+        if addresses is not None:
+            return addresses
+        if pending is not None:
+            return await asyncio.shield(pending)
+        
+        loop = asyncio.get_running_loop()
+        pending = loop.create_future()
+        self._pending[hostname] = pending
+        try:
+            addrinfo = await loop.getaddrinfo(hostname, port, type=socket.SOCK_STREAM)
+            addresses = self._store(hostname, addrinfo)
+            pending.set_result(addresses)
+            return addresses
+        except asyncio.CancelledError:
+            pending.cancel()
+            raise
+        except Exception as e:
+            pending.set_exception(e)
+            # Mark the exception as retrieved when nobody else is waiting
+            pending.exception()
+            raise
+        finally:
+            del self._pending[hostname]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+_scan_context = None
+_dns_cache = None
+
+
+class RateLimiter:
+    """Token buckets keyed by an arbitrary string, e.g. a subnet
+
+    Each key may start `burst` operations at once and `rate` per second
+    after that. Buckets that have refilled completely are dropped once the
+    table grows large, so sweeping many subnets does not leak memory.
+    A rate of 0 disables limiting.
+    """
+    
+    PRUNE_THRESHOLD = 4096
+    
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.burst = burst or max(1, rate)
+        self._buckets = {}
+    
+    def reserve(self, key, now=None):
+        """Take one token for key and return how long to wait before using it"""
+        if not self.rate:
+            return 0
+        if now is None:
+            now = time.monotonic()
+        
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        self._buckets[key] = (tokens, now)
+        
+        if len(self._buckets) > self.PRUNE_THRESHOLD:
+            self._prune(now)
+        
+        return 0 if tokens >= 0 else -tokens / self.rate
+    
+    def _prune(self, now):
+        refill = self.burst / self.rate
+        self._buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self._buckets.items()
+            if now - updated < refill
+        }
+    
+    async def acquire(self, key):
+        """Wait until an operation for key may start
+
+        Inside _iter_concurrently() the task gives up its slot while it
+        waits, so a throttled endpoint does not hold back other endpoints.
+        """
+        delay = self.reserve(key)
+        if delay:
+            await _throttle(delay)
+
+
+async def _throttle(delay):
+    """Sleep for a rate limit without holding a concurrency slot"""
+    slots = _scan_slots.get()
+    if slots is None:
+        await asyncio.sleep(delay)
+        return
+    
+    slots.release()
+    await asyncio.sleep(delay)
+    await slots.acquire()
+
+
+def subnet_key(address):
+    """Return the /24 (IPv4) or /64 (IPv6) network an address belongs to"""
+    address = ipaddress.ip_address(address)
+    prefix = 24 if address.version == 4 else 64
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+class EndpointRateLimits:
+    """Handshake rate limits per resolved IP and per /24 for one scan run
+
+    Defaults come from the scan_rate_per_ip and scan_rate_per_subnet
+    settings; 0 disables a limit.
+    """
+    
+    def __init__(self, per_ip=None, per_subnet=None):
+        if per_ip is None:
+            per_ip = get_plugin_setting('scan_rate_per_ip')
+        if per_subnet is None:
+            per_subnet = get_plugin_setting('scan_rate_per_subnet')
+        self.per_ip = RateLimiter(per_ip)
+        self.per_subnet = RateLimiter(per_subnet)
+    
+    async def acquire(self, address):
+        """Wait until a handshake to address may start"""
+        await self.per_ip.acquire(address)
+        await self.per_subnet.acquire(subnet_key(address))
+
+
+def get_scan_context():
+    """Return the shared TLS client context used for scanning
+
+    Certificate verification is disabled, so the context is built once
+    without loading the system CA store. SSLContext is safe to share
+    across threads and event loops.
+    """
+    global _scan_context
+    if _scan_context is None:
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        _scan_context = context
+    return _scan_context
+
+
+def get_dns_cache():
+    """Return the process-wide DNS cache used for scanning"""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = DNSCache(get_plugin_setting('scan_dns_ttl'))
+    return _dns_cache
+
+
+def scan_cache_stats():
+    """Return hit/miss counters of the shared scan caches"""
+    return {
+        'dns': get_dns_cache().stats(),
+        'certificates': certificate_cache.stats(),
+    }
+
+
+def _scan_failure(hostname, port, error, error_class='unexpected'):
+    """Build the result dict for a failed scan"""
+    logger.error(f"Scan failed for {hostname}:{port} - {error}")
+    return {
+        'success': False,
+        'error': error,
+        'error_class': error_class,
+        'hostname': hostname,
+        'port': port,
+    }
+
+
+class _PlainProtocol(asyncio.Protocol):
+    """Protocol of a connection until start_tls() takes it over
+
+    Records whether the peer sent data or hung up first, which a TLS
+    server never does, so such endpoints fail at once instead of leaving
+    start_tls() waiting for the handshake timeout.
+    """
+    
+    def __init__(self):
+        self.early_data = False
+        self.closed = False
+    
+    def data_received(self, data):
+        self.early_data = True
+    
+    def eof_received(self):
+        self.closed = True
+    
+    def connection_lost(self, exc):
+        self.closed = True
+
+
+def _connect(addresses, port, timeout):
+    """Open a TCP connection to the first reachable address"""
+    last_error = None
+    for address in addresses:
+        try:
+            return socket.create_connection((address, port), timeout=timeout)
+        except OSError as e:
+            last_error = e
+    raise last_error
+
+
+async def _async_connect(loop, addresses, port, timeout, rate_limits=None):
+    """Open a TCP transport to the first reachable address
+
+    Each attempt gets `timeout` seconds and, with rate_limits, first waits
+    for capacity on the address it is about to connect to. Returns
+    (transport, protocol, started) where started is the loop time of the
+    successful attempt.
+    """
+    last_error = None
+    for address in addresses:
+        if rate_limits is not None:
+            await rate_limits.acquire(address)
+        started = loop.time()
+        try:
+            transport, protocol = await asyncio.wait_for(
+                loop.create_connection(_PlainProtocol, address, port),
+                timeout
+            )
+            return transport, protocol, started
+        except (asyncio.TimeoutError, OSError) as e:
+            last_error = e
+    raise last_error
+
+
+def _encode_certificate(der_cert):
+    """Return (PEM text, SHA-256 fingerprint, expiry) for a DER encoded certificate"""
+    cert = certificate_cache.load_der(der_cert)
+    pem_cert = cert.public_bytes(
+        encoding=serialization.Encoding.PEM
+    ).decode('utf-8')
+    # Importing the PEM later then reuses this parse
+    certificate_cache.add(pem_cert, cert)
+    return (
+        pem_cert,
+        format_fingerprint(cert.fingerprint(hashes.SHA256())),
+        cert.not_valid_after_utc,
+    )
+
+
+def _presented_chain(ssl_object):
+    """Return (PEM list, fingerprint list) for the certificates sent after the leaf
+
+    Python 3.13 exposes get_unverified_chain() on SSLSocket and SSLObject;
+    older versions only have it on the underlying _ssl object.
+    """
+    get_chain = getattr(ssl_object, 'get_unverified_chain', None)
+    if get_chain is None:
+        get_chain = getattr(getattr(ssl_object, '_sslobj', None), 'get_unverified_chain', None)
+    if get_chain is None:
+        return [], []
+    
+    chain, fingerprints = [], []
+    for chain_cert in (get_chain() or [])[1:]:
+        if not isinstance(chain_cert, bytes):
+            chain_cert = chain_cert.public_bytes(_ssl.ENCODING_DER)
+        pem_cert, fingerprint, valid_until = _encode_certificate(chain_cert)
+        chain.append(pem_cert)
+        fingerprints.append(fingerprint)
+    return chain, fingerprints
+
 
 def scan_domain(hostname, port=443, timeout=10):
     """Scan domain and retrieve SSL certificate"""
     
     logger.info(f"Scanning {hostname}:{port}")
     
-    context = ssl.create_default_context()
-    context.check_hostname = False
-    context.verify_mode = ssl.CERT_NONE
+    context = get_scan_context()
+    started = time.monotonic()
     
     try:
-        with socket.create_connection((hostname, port), timeout=timeout) as sock:
+        addresses = get_dns_cache().resolve(hostname, port)
+        with _connect(addresses, port, timeout) as sock:
             with context.wrap_socket(sock, server_hostname=hostname) as ssock:
                 # Get certificate in DER format
                 der_cert = ssock.getpeercert(binary_form=True)
                 
                 # Convert to PEM
-                cert = x509.load_der_x509_certificate(der_cert, default_backend())
-                pem_cert = cert.public_bytes(
-                    encoding=serialization.Encoding.PEM
-                ).decode('utf-8')
+                pem_cert, fingerprint, valid_until = _encode_certificate(der_cert)
                 
-                # Get certificate chain
-                chain = []
-                try:
-                    # Try to get full chain (not always available)
-                    chain_certs = ssock.get_peer_cert_chain()
-                    if chain_certs:
-                        for chain_cert in chain_certs[1:]:  # Skip first (server cert)
-                            chain_pem = chain_cert.public_bytes(
-                                encoding=serialization.Encoding.PEM
-                            ).decode('utf-8')
-                            chain.append(chain_pem)
-                except AttributeError:
-                    # get_peer_cert_chain not available in all Python versions
-                    pass
+                # Get the certificate chain presented by the server
+                chain, chain_fingerprints = _presented_chain(ssock)
                 
                 logger.info(f"Successfully scanned {hostname}:{port}")
                 
                 return {
                     'success': True,
                     'certificate': pem_cert,
+                    'fingerprint_sha256': fingerprint,
+                    'valid_until': valid_until,
                     'chain': chain,
+                    'chain_fingerprints': chain_fingerprints,
                     'hostname': hostname,
                     'port': port,
                     'protocol': ssock.version(),
                     'cipher': ssock.cipher(),
+                    'latency': time.monotonic() - started,
                 }
     
     except socket.timeout:
-        error = f"Connection timeout after {timeout} seconds"
-        logger.error(f"Scan failed for {hostname}:{port} - {error}")
-        return {
-            'success': False,
-            'error': error,
-            'hostname': hostname,
-            'port': port,
-        }
+        return _scan_failure(
+            hostname, port, f"Connection timeout after {timeout} seconds", 'timeout'
+        )
     except socket.gaierror as e:
-        error = f"DNS resolution failed: {str(e)}"
-        logger.error(f"Scan failed for {hostname}:{port} - {error}")
-        return {
-            'success': False,
-            'error': error,
-            'hostname': hostname,
-            'port': port,
-        }
+        return _scan_failure(hostname, port, f"DNS resolution failed: {str(e)}", 'dns')
     except ssl.SSLError as e:
-        error = f"SSL error: {str(e)}"
-        logger.error(f"Scan failed for {hostname}:{port} - {error}")
-        return {
-            'success': False,
-            'error': error,
-            'hostname': hostname,
-            'port': port,
-        }
+        return _scan_failure(hostname, port, f"SSL error: {str(e)}", 'ssl')
+    except ConnectionError as e:
+        return _scan_failure(hostname, port, f"Connection failed: {str(e)}", 'connection')
     except Exception as e:
-        error = f"Unexpected error: {str(e)}"
-        logger.error(f"Scan failed for {hostname}:{port} - {error}")
-        return {
-            'success': False,
-            'error': error,
-            'hostname': hostname,
-            'port': port,
-        }
+        return _scan_failure(hostname, port, f"Unexpected error: {str(e)}")
 
 
-def auto_import_from_domain(hostname, port=443, name=None, update_existing=True):
-    """Automatically import certificate from domain"""
+class ChainImporter:
+    """Imports presented intermediate certificates once per fingerprint
+
+    Known fingerprints are kept in memory, so each distinct intermediate
+    costs at most one lookup query for a whole sweep. Share one instance
+    across all imports of a run.
+    """
     
-    result = scan_domain(hostname, port)
+    def __init__(self):
+        self._known = {}
+        self._created = []
     
-    if not result['success']:
-        return None, result['error']
+    def _lookup(self, fingerprints):
+        missing = [fp for fp in fingerprints if fp not in self._known]
+        if missing:
+            found = dict(
+                Certificate.objects.filter(fingerprint_sha256__in=missing).values_list(
+                    'fingerprint_sha256', 'pk'
+                )
+            )
+            for fingerprint in missing:
+                self._known[fingerprint] = found.get(fingerprint)
     
+    def import_chain(self, chain, fingerprints):
+        """Import the intermediates of a chain and return the leaf issuer's pk
+
+        Each intermediate's ca_certificate is wired to the next certificate
+        in the chain. Returns None for an empty chain.
+        """
+        if not chain:
+            return None
+        self._lookup(fingerprints)
+        
+        issuer_id = None
+        for pem_cert, fingerprint in reversed(list(zip(chain, fingerprints))):
+            pk = self._known[fingerprint]
+            if pk is None:
+                cert = Certificate(
+                    certificate_file=pem_cert,
+                    ca_certificate_id=issuer_id,
+                    description='Intermediate certificate presented by a scanned endpoint',
+                    last_seen=datetime.now(timezone.utc),
+                )
+                cert._parse_certificate()
+                # Cut a long CN so the name fits Certificate.name
+                suffix = f" ({fingerprint[:23]})"
+                max_length = Certificate._meta.get_field('name').max_length
+                cert.name = cert.common_name[:max_length - len(suffix)] + suffix
+                cert.save()
+                logger.info(f"Created intermediate certificate: {cert.name}")
+                pk = self._known[fingerprint] = cert.pk
+                self._created.append(fingerprint)
+            issuer_id = pk
+        
+        return issuer_id
+    
+    @contextmanager
+    def rollback_on_error(self):
+        """Forget certificates created in the block if it raises
+
+        The caller's transaction rolls them back, so they must be created
+        again by the next import that sees them.
+        """
+        created = len(self._created)
+        try:
+            yield
+        except Exception:
+            for fingerprint in self._created[created:]:
+                self._known.pop(fingerprint, None)
+            del self._created[created:]
+            raise
+
+
+def import_scan_result(result, name=None, update_existing=True, chain_importer=None):
+    """Create or update a certificate from a successful scan result
+
+    Intermediates presented by the server are imported once and wired as
+    ca_certificate. Pass a shared ChainImporter when importing many results.
+    """
+    if chain_importer is None:
+        chain_importer = ChainImporter()
+    
+    with chain_importer.rollback_on_error():
+        return _import_scan_result(result, name, update_existing, chain_importer)
+
+
+def _import_scan_result(result, name, update_existing, chain_importer):
+    hostname = result['hostname']
+    port = result['port']
     certificate_name = name or f"{hostname}:{port}"
     
     # Check if certificate already exists
     existing = Certificate.objects.filter(name=certificate_name).first()
     
+    if existing and not update_existing:
+        return existing, "Certificate already exists (not updated)"
+    
+    issuer_id = chain_importer.import_chain(
+        result.get('chain', []), result.get('chain_fingerprints', [])
+    )
+    
     description = f"Auto-imported from {hostname}:{port}"
     if result.get('protocol'):
         description += f" (Protocol: {result['protocol']}, Cipher: {result['cipher'][0]})"
     
+    now = datetime.now(timezone.utc)
+    
     if existing:
-        if update_existing:
-            # Update existing certificate
-            existing.certificate_file = result['certificate']
-            existing.description = description
-            existing.save()
-            logger.info(f"Updated certificate: {certificate_name}")
-            return existing, "Certificate updated"
+        unchanged = existing.fingerprint_sha256 == result['fingerprint_sha256']
+        if unchanged and (issuer_id is None or existing.ca_certificate_id is not None):
+            # Same certificate still served: skip the save (and its
+            # re-parse, signals and changelog entry), only mark it seen
+            Certificate.objects.filter(pk=existing.pk).update(last_seen=now)
+            existing.last_seen = now
+            return existing, "Certificate unchanged"
+        
+        # Update existing certificate
+        existing.certificate_file = result['certificate']
+        existing.description = description
+        existing.last_seen = now
+        if issuer_id is not None:
+            existing.ca_certificate_id = issuer_id
+        existing.save()
+        logger.info(f"Updated certificate: {certificate_name}")
+        return existing, "Certificate updated"
+    
+    # Create new certificate
+    cert = Certificate(
+        name=certificate_name,
+        description=description,
+        certificate_file=result['certificate'],
+        ca_certificate_id=issuer_id,
+        last_seen=now,
+    )
+    cert.save()
+    logger.info(f"Created new certificate: {certificate_name}")
+    return cert, "Certificate imported"
+
+
+def auto_import_from_domain(hostname, port=443, name=None, update_existing=True):
+    """Automatically import certificate from domain"""
+    
+    result = scan_domain(hostname, port)
+    
+    if not result['success']:
+        return None, result['error']
+    
+    return import_scan_result(result, name, update_existing)
+
+
+def auto_import_from_domains(hostnames, port=443, update_existing=True, **scan_options):
+    """Scan and import multiple domains
+
+    Yields (result, certificate, message) as soon as each scan finishes,
+    in completion order. `scan_options` are passed to iter_scan_domains().
+    """
+    chain_importer = ChainImporter()
+    for result in iter_scan_domains(hostnames, port, **scan_options):
+        if not result['success']:
+            yield result, None, result['error']
+            continue
+        
+        certificate, message = import_scan_result(
+            result, update_existing=update_existing, chain_importer=chain_importer
+        )
+        yield result, certificate, message
+
+
+async def async_scan_domain(hostname, port=443, connect_timeout=None, handshake_timeout=None,
+                            rate_limits=None):
+    """Scan domain without blocking the event loop
+
+    Returns the same result dict as scan_domain(). The TCP connect and the
+    TLS handshake are bounded by separate timeouts so a filtered host fails
+    fast while a slow TLS stack still gets a fair chance. With rate_limits
+    (an EndpointRateLimits) each connect attempt waits for the address it
+    connects to and its subnet to have capacity.
+    """
+    if connect_timeout is None:
+        connect_timeout = get_plugin_setting('scan_connect_timeout')
+    
+    logger.info(f"Scanning {hostname}:{port}")
+    
+    loop = asyncio.get_running_loop()
+    
+    try:
+        addresses = await get_dns_cache().async_resolve(hostname, port)
+        try:
+            transport, protocol, started = await _async_connect(
+                loop, addresses, port, connect_timeout, rate_limits
+            )
+        except asyncio.TimeoutError:
+            return _scan_failure(
+                hostname, port, f"Connection timeout after {connect_timeout} seconds", 'timeout'
+            )
+    except socket.gaierror as e:
+        return _scan_failure(hostname, port, f"DNS resolution failed: {str(e)}", 'dns')
+    except ConnectionError as e:
+        return _scan_failure(hostname, port, f"Connection failed: {str(e)}", 'connection')
+    except Exception as e:
+        return _scan_failure(hostname, port, f"Unexpected error: {str(e)}")
+    
+    return await _async_handshake(
+        loop, transport, protocol, hostname, port, handshake_timeout, started
+    )
+
+
+async def _async_handshake(loop, transport, protocol, hostname, port, handshake_timeout, started):
+    """Run the TLS handshake on a connected transport and build the result
+
+    A hostname of None sends no SNI, which returns the server's default
+    certificate. The transport is always closed before returning.
+    """
+    if handshake_timeout is None:
+        handshake_timeout = get_plugin_setting('scan_handshake_timeout')
+    
+    try:
+        if transport.is_closing() or getattr(protocol, 'closed', False):
+            return _scan_failure(
+                hostname, port, "Connection closed before TLS handshake", 'connection'
+            )
+        if getattr(protocol, 'early_data', False):
+            return _scan_failure(
+                hostname, port, "Peer sent data before TLS handshake (not a TLS service)", 'connection'
+            )
+        
+        try:
+            tls_transport = await asyncio.wait_for(
+                loop.start_tls(
+                    transport,
+                    protocol,
+                    get_scan_context(),
+                    server_hostname=hostname,
+                ),
+                handshake_timeout
+            )
+        except asyncio.TimeoutError:
+            return _scan_failure(
+                hostname, port, f"Handshake timeout after {handshake_timeout} seconds", 'timeout'
+            )
+        
+        # start_tls() returns None when the peer closes during the handshake
+        if tls_transport is None:
+            return _scan_failure(
+                hostname, port, "Connection closed during TLS handshake", 'connection'
+            )
+        transport = tls_transport
+        
+        ssl_object = transport.get_extra_info('ssl_object')
+        der_cert = ssl_object.getpeercert(binary_form=True)
+        
+        pem_cert, fingerprint, valid_until = _encode_certificate(der_cert)
+        chain, chain_fingerprints = _presented_chain(ssl_object)
+        
+        logger.info(f"Successfully scanned {hostname}:{port}")
+        
+        return {
+            'success': True,
+            'certificate': pem_cert,
+            'fingerprint_sha256': fingerprint,
+            'valid_until': valid_until,
+            'chain': chain,
+            'chain_fingerprints': chain_fingerprints,
+            'hostname': hostname,
+            'port': port,
+            'protocol': ssl_object.version(),
+            'cipher': ssl_object.cipher(),
+            'latency': loop.time() - started,
+        }
+    
+    except ssl.SSLError as e:
+        return _scan_failure(hostname, port, f"SSL error: {str(e)}", 'ssl')
+    except ConnectionError as e:
+        return _scan_failure(hostname, port, f"Connection failed: {str(e)}", 'connection')
+    except Exception as e:
+        return _scan_failure(hostname, port, f"Unexpected error: {str(e)}")
+    finally:
+        if transport is not None:
+            transport.abort()
+
+
+async def async_probe_scan(address, port, probe_timeout=None, handshake_timeout=None, limiter=None):
+    """Scan address:port only if a TCP connect succeeds first
+
+    Returns None when the port is closed or filtered. Otherwise the TLS
+    handshake runs on the probe connection and the scan_domain() result
+    is returned, with the address in place of the hostname. When a
+    RateLimiter is given, probes are throttled per subnet.
+    """
+    if probe_timeout is None:
+        probe_timeout = get_plugin_setting('sweep_probe_timeout')
+    if limiter is not None:
+        await limiter.acquire(subnet_key(address))
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    
+    try:
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(_PlainProtocol, address, port),
+            probe_timeout
+        )
+    except (asyncio.TimeoutError, OSError):
+        return None
+    
+    return await _async_handshake(
+        loop, transport, protocol, address, port, handshake_timeout, started
+    )
+
+
+def parse_targets(lines, port=443):
+    """Parse target lines of the form host[:port][,name]
+
+    Yields (hostname, port, name) tuples; name is None when omitted. Blank
+    lines and lines starting with '#' are skipped. IPv6 addresses must be
+    bracketed when a port is given, e.g. [2001:db8::1]:8443.
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        
+        endpoint, _, name = line.partition(',')
+        endpoint = endpoint.strip()
+        name = name.strip() or None
+        target_port = port
+        
+        if endpoint.startswith('['):
+            hostname, _, rest = endpoint[1:].partition(']')
+            if rest.startswith(':'):
+                target_port = rest[1:]
+        elif endpoint.count(':') == 1:
+            hostname, target_port = endpoint.split(':')
         else:
-            return existing, "Certificate already exists (not updated)"
+            hostname = endpoint
+        
+        try:
+            target_port = int(target_port)
+        except ValueError:
+            raise ValueError(f"Invalid port in target line: {line}")
+        
+        yield hostname, target_port, name
+
+
+def _parse_target(target, port):
+    """Return (hostname, port) for a bare hostname or a (hostname, port) pair"""
+    if isinstance(target, str):
+        return target.strip(), port
+    hostname, target_port = target
+    return hostname.strip(), target_port
+
+
+def _iter_concurrently(scan, items, concurrency):
+    """Run the coroutine function `scan` for every item on a background loop
+
+    Yields (item, result) pairs in completion order. At most `concurrency`
+    items are being scanned or waiting to be consumed at any time, so memory
+    stays flat regardless of the number of items, and a slow consumer
+    throttles the scan instead of letting results pile up. Items waiting for
+    a rate limit hand their slot back (up to THROTTLED_BACKLOG times
+    `concurrency` of them), so one busy endpoint does not stall the rest of
+    the run. The event loop keeps running while the consumer works, so
+    in-flight handshakes are not stalled into spurious timeouts.
+
+    `items` is iterated on the background thread and must not touch the
+    database.
+    """
+    loop = asyncio.new_event_loop()
+    results = queue.Queue()
+    slots = asyncio.Semaphore(concurrency)
+    backlog = asyncio.Semaphore(concurrency * (THROTTLED_BACKLOG + 1))
+    
+    async def run(item):
+        _scan_slots.set(slots)
+        try:
+            result = await scan(item)
+        except Exception as e:
+            result = e
+        results.put((item, result))
+    
+    async def produce():
+        tasks = set()
+        error = None
+        try:
+            for item in items:
+                await backlog.acquire()
+                await slots.acquire()
+                task = loop.create_task(run(item))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.wait(tasks)
+        except Exception as e:
+            # Raised by `items` itself (bad input); re-raised in the consumer
+            error = e
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            results.put((_DONE, error))
+    
+    def run_loop():
+        try:
+            loop.run_until_complete(main)
+        except asyncio.CancelledError:
+            pass
+    
+    main = loop.create_task(produce())
+    worker = threading.Thread(
+        target=run_loop,
+        name='ssl-scan-loop',
+        daemon=True
+    )
+    worker.start()
+    
+    try:
+        while True:
+            entry = results.get()
+            if entry[0] is _DONE:
+                if entry[1] is not None:
+                    raise entry[1]
+                break
+            loop.call_soon_threadsafe(slots.release)
+            loop.call_soon_threadsafe(backlog.release)
+            
+            item, result = entry
+            if isinstance(result, Exception):
+                raise result
+            yield item, result
+    finally:
+        if not main.done():
+            loop.call_soon_threadsafe(main.cancel)
+        worker.join()
+        loop.close()
+
+
+def iter_scan_targets(targets, concurrency=None, connect_timeout=None, handshake_timeout=None,
+                      rate_limits=None):
+    """Scan (hostname, port, ...) tuples, yielding (target, result) pairs
+
+    Results are yielded in completion order. Extra tuple members are carried through untouched so callers can attach
+    their own bookkeeping to each target. Handshakes are rate limited per
+    resolved IP and per /24 (see EndpointRateLimits), so many names behind
+    one load balancer do not hit it all at once.
+    """
+    if concurrency is None:
+        concurrency = get_plugin_setting('scan_concurrency')
+    if rate_limits is None:
+        rate_limits = EndpointRateLimits()
+    
+    async def scan(target):
+        return await async_scan_domain(
+            target[0], target[1], connect_timeout, handshake_timeout, rate_limits
+        )
+    
+    return _iter_concurrently(scan, targets, concurrency)
+
+
+def iter_scan_domains(hostnames, port=443, concurrency=None,
+                      connect_timeout=None, handshake_timeout=None):
+    """Scan multiple domains concurrently, yielding each result as it finishes
+
+    Accepts the same targets as bulk_scan_domains(). Results are yielded in
+    completion order, so a sweep can be imported or reported incrementally.
+    """
+    targets = (_parse_target(target, port) for target in hostnames)
+    for target, result in iter_scan_targets(
+        targets, concurrency, connect_timeout, handshake_timeout
+    ):
+        yield result
+
+
+def network_endpoints(networks, ports):
+    """Yield (address, port) for every host address in the given networks
+
+    Accepts network strings or ipaddress objects; a bare address counts as
+    a single host. Addresses are interleaved across /24s (/64s for IPv6),
+    one from each subnet in turn, so the per-subnet rate limit of a sweep
+    spreads the load instead of throttling the whole run.
+    """
+    blocks = []
+    for network in networks:
+        network = ipaddress.ip_network(network, strict=False)
+        size = network.num_addresses
+        block = min(size, 2 ** (network.max_prefixlen - (24 if network.version == 4 else 64)))
+        # Same addresses as network.hosts(): no network or broadcast address
+        # in IPv4, no subnet-router anycast address in IPv6
+        if size <= 2:
+            excluded = ()
+        elif network.version == 4:
+            excluded = (0, size - 1)
+        else:
+            excluded = (0,)
+        blocks.append((network.network_address, block, size // block, excluded))
+    
+    offset = 0
+    while blocks:
+        for first, block, count, excluded in blocks:
+            for index in range(offset, block * count, block):
+                if index not in excluded:
+                    address = str(first + index)
+                    for port in ports:
+                        yield address, port
+        offset += 1
+        blocks = [entry for entry in blocks if entry[1] > offset]
+
+
+def iter_sweep_network(networks, ports=(443,), concurrency=None, probe_timeout=None,
+                       handshake_timeout=None, subnet_rate=None):
+    """Sweep whole networks for TLS endpoints, yielding (address, port, result)
+
+    Every address/port pair is probed with a plain TCP connect first and
+    only open ports get a TLS handshake; result is None for closed or
+    filtered ports. Endpoints are generated lazily, so memory does not grow
+    with the size of the networks. Probes are limited to `subnet_rate` per
+    second per /24 (/64 for IPv6).
+    """
+    if concurrency is None:
+        concurrency = get_plugin_setting('scan_concurrency')
+    if subnet_rate is None:
+        subnet_rate = get_plugin_setting('sweep_subnet_rate')
+    
+    limiter = RateLimiter(subnet_rate)
+    
+    async def scan(endpoint):
+        return await async_probe_scan(
+            endpoint[0], endpoint[1], probe_timeout, handshake_timeout, limiter
+        )
+    
+    for (address, port), result in _iter_concurrently(
+        scan, network_endpoints(networks, ports), concurrency
+    ):
+        yield address, port, result
+
+
+async def _async_scan_address(address, port, hostname, connect_timeout, handshake_timeout,
+                              rate_limits):
+    """Scan an already resolved address, sending hostname as SNI"""
+    if connect_timeout is None:
+        connect_timeout = get_plugin_setting('scan_connect_timeout')
+    if rate_limits is not None:
+        await rate_limits.acquire(address)
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    
+    try:
+        transport, protocol = await asyncio.wait_for(
+            loop.create_connection(_PlainProtocol, address, port),
+            connect_timeout
+        )
+    except asyncio.TimeoutError:
+        return _scan_failure(
+            hostname or address, port, f"Connection timeout after {connect_timeout} seconds", 'timeout'
+        )
+    except OSError as e:
+        return _scan_failure(hostname or address, port, f"Connection failed: {str(e)}", 'connection')
+    
+    result = await _async_handshake(
+        loop, transport, protocol, hostname, port, handshake_timeout, started
+    )
+    result['hostname'] = hostname or address
+    result['address'] = address
+    return result
+
+
+def iter_sni_fanout(targets, pool_size=None, concurrency=None, connect_timeout=None,
+                    handshake_timeout=None, rate_limits=None):
+    """Scan many SNI names per address, yielding one group per address
+
+    Targets are (hostname, port, ...) tuples as for iter_scan_targets().
+    Every hostname is resolved once and the targets are grouped by their
+    first address and port. Each group is scanned over at most `pool_size`
+    concurrent connections to that address, plus one handshake without SNI
+    to capture the default certificate.
+
+    Yields (address, port, default_result, [(target, result), ...]). Each
+    successful result carries 'address' and 'is_default', which is True when
+    the name got the default certificate. Targets that fail to resolve are
+    yielded in a group with address and default_result set to None.
+    """
+    if pool_size is None:
+        pool_size = get_plugin_setting('sni_pool_size')
+    if concurrency is None:
+        concurrency = get_plugin_setting('scan_concurrency')
+    if rate_limits is None:
+        rate_limits = EndpointRateLimits()
+    
+    async def resolve(target):
+        try:
+            return await get_dns_cache().async_resolve(target[0], target[1])
+        except socket.gaierror as e:
+            return _scan_failure(target[0], target[1], f"DNS resolution failed: {str(e)}", 'dns')
+    
+    groups = {}
+    unresolved = []
+    for target, addresses in _iter_concurrently(resolve, targets, concurrency):
+        if isinstance(addresses, dict):
+            unresolved.append((target, addresses))
+        else:
+            groups.setdefault((addresses[0], target[1]), []).append(target)
+    
+    if unresolved:
+        yield None, None, None, unresolved
+    
+    async def scan_group(group):
+        (address, port), members = group
+        pool = asyncio.Semaphore(pool_size)
+        # Members share one address, so the group keeps its slot while they
+        # wait for its rate limit
+        _scan_slots.set(None)
+        
+        async def scan(hostname):
+            async with pool:
+                return await _async_scan_address(
+                    address, port, hostname, connect_timeout, handshake_timeout, rate_limits
+                )
+        
+        return await asyncio.gather(
+            scan(None), *(scan(target[0]) for target in members)
+        )
+    
+    # Each group holds up to pool_size connections, so fewer groups run at once
+    group_concurrency = max(1, concurrency // pool_size)
+    for ((address, port), members), (default_result, *results) in _iter_concurrently(
+        scan_group, list(groups.items()), group_concurrency
+    ):
+        default_fingerprint = default_result.get('fingerprint_sha256')
+        for result in results:
+            result['is_default'] = bool(
+                result['success'] and result['fingerprint_sha256'] == default_fingerprint
+            )
+        yield address, port, default_result, list(zip(members, results))
+
+
+def bulk_scan_domains(hostnames, port=443, concurrency=None,
+                      connect_timeout=None, handshake_timeout=None):
+    """Scan multiple domains concurrently
+
+    `hostnames` may contain bare hostnames (scanned on `port`) or
+    (hostname, port) pairs. Results are returned in input order.
+    """
+    hostnames = list(hostnames)
+    results = [None] * len(hostnames)
+    
+    targets = (
+        (*_parse_target(target, port), index)
+        for index, target in enumerate(hostnames)
+    )
+    for target, result in iter_scan_targets(
+        targets, concurrency, connect_timeout, handshake_timeout
+    ):
+        results[target[2]] = result
+    
+    return results
+
+
+def default_worker_id():
+    """Identify this process as the owner of scan target leases"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def record_scan_result(target, result, certificate=None, now=None, owner=None):
+    """Store the outcome of a scan on its ScanTarget and schedule the next one
+
+    `target` is a row from sweep_scan_targets(). After a success the next
+    scan time follows the expiry of the served certificate and how recently
+    it changed (see scheduler.rescan_interval()); after a failure it backs
+    off exponentially until the circuit opens (see
+    scheduler.failure_backoff()). Uses a queryset update, so recording scan
+    state creates no changelog entries and fires no signals.
+
+    When `owner` is given the target's lease is released, and the result is
+    only written while the lease is still held. Returns whether the target
+    was updated.
+    """
+    if now is None:
+        now = datetime.now(timezone.utc)
+    
+    fields = {'last_scanned': now}
+    if result['success']:
+        last_changed = target.last_changed
+        if target.last_fingerprint and target.last_fingerprint != result['fingerprint_sha256']:
+            last_changed = now
+        
+        fields.update(
+            last_fingerprint=result['fingerprint_sha256'],
+            last_changed=last_changed,
+            last_error='',
+            last_error_class='',
+            consecutive_failures=0,
+            next_scan_at=next_scan_time(now, result['valid_until'], last_changed),
+        )
+        if certificate is not None:
+            fields['certificate'] = certificate
     else:
-        # Create new certificate
-        cert = Certificate(
-            name=certificate_name,
-            description=description,
-            certificate_file=result['certificate'],
+        failures = target.consecutive_failures + 1
+        fields.update(
+            last_error=result['error'],
+            last_error_class=result.get('error_class', 'unexpected'),
+            consecutive_failures=failures,
+            next_scan_at=now + failure_backoff(failures),
+        )
+    
+    targets = ScanTarget.objects.filter(pk=target.pk)
+    if owner is not None:
+        targets = targets.filter(lease_owner=owner)
+        fields.update(lease_owner='', lease_expires=None)
+    
+    updated = targets.update(**fields)
+    if not updated and owner is not None:
+        logger.warning(
+            f"Lease on {target.hostname}:{target.port} was lost by {owner}; result discarded"
+        )
+    return bool(updated)
+
+
+def scan_history_entry(target, result, now=None):
+    """Build an unsaved ScanResult row for a scan of target"""
+    if result['success']:
+        return ScanResult(
+            target_id=target.pk,
+            timestamp=now or datetime.now(timezone.utc),
+            fingerprint=result['fingerprint_sha256'],
+            protocol=result.get('protocol') or '',
+            cipher=(result.get('cipher') or ('',))[0][:100],
+            latency=result.get('latency'),
         )
-        cert.save()
-        logger.info(f"Created new certificate: {certificate_name}")
-        return cert, "Certificate imported"
+    return ScanResult(
+        target_id=target.pk,
+        timestamp=now or datetime.now(timezone.utc),
+        error_class=result.get('error_class', 'unexpected'),
+    )
 
 
-def bulk_scan_domains(hostnames, port=443):
-    """Scan multiple domains"""
-    results = []
+def prune_scan_history(retention_days=None, chunk_size=10000, now=None):
+    """Delete ScanResult rows older than the retention period in chunks
+
+    Deleting a bounded number of rows per statement keeps locks and
+    transaction size small on large history tables. Returns the number of
+    rows deleted.
+    """
+    if retention_days is None:
+        retention_days = get_plugin_setting('scan_history_retention_days')
+    if now is None:
+        now = datetime.now(timezone.utc)
+    
+    cutoff = now - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        pks = list(
+            ScanResult.objects.filter(timestamp__lt=cutoff).values_list('pk', flat=True)[:chunk_size]
+        )
+        if not pks:
+            break
+        ScanResult.objects.filter(pk__in=pks).delete()
+        deleted += len(pks)
+    
+    logger.info(f"Pruned {deleted} scan results older than {retention_days} days")
+    return deleted
+
+
+def scan_targets(targets, concurrency=None, update_existing=True,
+                 import_certificates=True, owner=None):
+    """Scan ScanTarget rows, import their certificates and record their state
+
+    Yields (target, result, certificate, message) in completion order.
+    Imported certificates are assigned to the target's device or virtual
+    machine in bulk once all targets have been scanned. A ScanResult history
+    row is written for every recorded scan, in batches of
+    scan_history_batch_size.
+    """
+    links = []
+    history = []
+    history_batch_size = get_plugin_setting('scan_history_batch_size')
+    chain_importer = ChainImporter()
     
-    for hostname in hostnames:
-        result = scan_domain(hostname.strip(), port)
-        results.append(result)
+    try:
+        for target, result in iter_scan_targets(targets, concurrency):
+            certificate = None
+            message = result.get('error')
+            
+            if result['success'] and import_certificates:
+                try:
+                    certificate, message = import_scan_result(
+                        result, target.name or None, update_existing, chain_importer
+                    )
+                except Exception as e:
+                    message = f"Import failed: {str(e)}"
+                    logger.error(f"Import failed for {target.hostname}:{target.port} - {str(e)}")
+            
+            now = datetime.now(timezone.utc)
+            if record_scan_result(target, result, certificate, now=now, owner=owner):
+                history.append(scan_history_entry(target, result, now))
+                if len(history) >= history_batch_size:
+                    ScanResult.objects.bulk_create(history)
+                    history = []
+            
+            if certificate is not None and (target.device_id or target.virtual_machine_id):
+                links.append((certificate.pk, target.device_id, target.virtual_machine_id))
+            yield target, result, certificate, message
+    finally:
+        ScanResult.objects.bulk_create(history)
+        link_certificates(links)
+
+
+def sweep_scan_targets(limit=None, concurrency=None, update_existing=True,
+                       import_certificates=True, owner=None, lease_seconds=None,
+                       batch_size=None):
+    """Lease due ScanTargets, scan them and record their state
+
+    Due targets are selected and leased with a single indexed query, so
+    any number of sweeps and workers can run side by side (see
+    ScanTargetQuerySet.lease_due()). Targets are leased `batch_size` at a
+    time and each batch is scanned before the next is claimed, so a long
+    sweep never holds leases that run out before their scan. Yields
+    (target, result, certificate, message) in completion order, where
+    target is a named row starting with (hostname, port, name, pk).
+    """
+    if owner is None:
+        owner = default_worker_id()
+    if lease_seconds is None:
+        lease_seconds = get_plugin_setting('scan_lease_seconds')
+    if batch_size is None:
+        batch_size = get_plugin_setting('scan_lease_batch_size')
     
-    return results
\ No newline at end of file
+    remaining = limit
+    while remaining is None or remaining > 0:
+        batch = batch_size if remaining is None else min(batch_size, remaining)
+        targets = ScanTarget.objects.lease_due(
+            owner, SWEEP_FIELDS, limit=batch, lease_seconds=lease_seconds
+        )
+        if not targets:
+            break
+        
+        yield from scan_targets(
+            targets, concurrency, update_existing, import_certificates, owner
+        )
+        
+        if remaining is not None:
+            remaining -= len(targets)
+        if len(targets) < batch:
+            break
@@ -0,0 +1,55 @@
+from datetime import timedelta
+from .config import get_plugin_setting
+
+
+def rescan_interval(days_until_expiry, last_changed=None, now=None):
+    """Return how long to wait before rescanning an endpoint
+
+    The interval shrinks as the served certificate approaches expiry, and
+    is capped further for endpoints whose certificate changed recently.
+    """
+    if days_until_expiry is None:
+        hours = get_plugin_setting('rescan_unknown_expiry_interval_hours')
+    else:
+        hours = None
+        for max_days, interval in get_plugin_setting('rescan_intervals'):
+            if max_days is None or days_until_expiry <= max_days:
+                hours = interval
+                break
+        if hours is None:
+            hours = get_plugin_setting('rescan_unknown_expiry_interval_hours')
+    
+    if last_changed is not None and now is not None:
+        recent = timedelta(days=get_plugin_setting('rescan_recent_change_days'))
+        if now - last_changed < recent:
+            hours = min(hours, get_plugin_setting('rescan_recent_change_interval_hours'))
+    
+    return timedelta(hours=hours)
+
+
+def next_scan_time(now, valid_until=None, last_changed=None):
+    """Return the next scan time for an endpoint scanned at `now`"""
+    days_until_expiry = None
+    if valid_until is not None:
+        days_until_expiry = (valid_until - now).days
+    return now + rescan_interval(days_until_expiry, last_changed, now)
+
+
+def circuit_threshold():
+    """Return the number of consecutive failures that opens the circuit"""
+    return get_plugin_setting('scan_circuit_threshold')
+
+
+def failure_backoff(consecutive_failures):
+    """Return the delay before retrying an endpoint after a failed scan
+
+    Doubles with every consecutive failure up to a cap. Once the circuit
+    is open the endpoint is only probed at the (long) probe interval.
+    """
+    if consecutive_failures >= circuit_threshold():
+        return timedelta(hours=get_plugin_setting('scan_circuit_probe_hours'))
+    
+    base = timedelta(minutes=get_plugin_setting('scan_backoff_base_minutes'))
+    cap = timedelta(hours=get_plugin_setting('scan_backoff_max_hours'))
+    exponent = min(max(consecutive_failures - 1, 0), 32)
+    return min(base * 2 ** exponent, cap)
@@ -1,6 +1,6 @@
 import django_tables2 as tables
 from netbox.tables import NetBoxTable, columns
-from .models import Certificate
+from .models import Certificate, ScanTarget
 
 
 class CertificateTable(NetBoxTable):
@@ -25,6 +25,7 @@ class CertificateTable(NetBoxTable):
     
     days_until_expiry = tables.Column(
         verbose_name='Days Until Expiry',
+        order_by=('expiry_days',),
         attrs={'td': {'class': 'text-end'}}
     )
     
@@ -38,6 +39,7 @@ class CertificateTable(NetBoxTable):
             <span class="badge bg-success">Valid</span>
         {% endif %}
         ''',
+        order_by=('expiry_days',),
         verbose_name='Status'
     )
     
@@ -49,4 +51,71 @@ class CertificateTable(NetBoxTable):
         )
         default_columns = (
             'name', 'common_name', 'issuer', 'valid_until', 'days_until_expiry', 'status'
-        )
\ No newline at end of file
+        )
+
+
+class ScanTargetTable(NetBoxTable):
+    """Table for displaying scan targets"""
+    
+    hostname = tables.Column(
+        linkify=True
+    )
+    
+    certificate = tables.Column(
+        linkify=True,
+        verbose_name='Certificate'
+    )
+    
+    device = tables.Column(
+        linkify=True,
+        verbose_name='Device'
+    )
+    
+    virtual_machine = tables.Column(
+        linkify=True,
+        verbose_name='Virtual Machine'
+    )
+    
+    enabled = columns.BooleanColumn(
+        verbose_name='Enabled'
+    )
+    
+    next_scan_at = tables.DateTimeColumn(
+        format='Y-m-d H:i',
+        verbose_name='Next Scan'
+    )
+    
+    last_scanned = tables.DateTimeColumn(
+        format='Y-m-d H:i',
+        verbose_name='Last Scanned'
+    )
+    
+    consecutive_failures = tables.Column(
+        verbose_name='Failures',
+        attrs={'td': {'class': 'text-end'}}
+    )
+    
+    last_error_class = tables.TemplateColumn(
+        template_code='''
+        {% if record.circuit_open %}
+            <span class="badge bg-danger" title="Circuit open">{{ record.get_last_error_class_display }}</span>
+        {% elif record.last_error_class %}
+            <span class="badge bg-warning">{{ record.get_last_error_class_display }}</span>
+        {% endif %}
+        ''',
+        verbose_name='Last Error'
+    )
+    
+    class Meta(NetBoxTable.Meta):
+        model = ScanTarget
+        fields = (
+            'pk', 'id', 'hostname', 'port', 'name', 'certificate', 'device',
+            'virtual_machine', 'enabled',
+            'next_scan_at', 'last_scanned', 'last_fingerprint', 'last_changed', 'last_error',
+            'last_error_class', 'consecutive_failures', 'description', 'created',
+            'last_updated'
+        )
+        default_columns = (
+            'hostname', 'port', 'certificate', 'enabled', 'next_scan_at',
+            'last_scanned', 'last_error_class', 'consecutive_failures'
+        )
@@ -13,7 +13,7 @@ class ObjectCertificates(PluginTemplateExtension):
         if not obj or not hasattr(obj, 'certificates'):
             return ''
         
-        certificates = obj.certificates.all()
+        certificates = obj.certificates.without_content()
         
         if not certificates.exists():
             return ''
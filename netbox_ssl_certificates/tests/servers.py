@@ -0,0 +1,184 @@
+"""Local TLS servers for scanner tests and benchmarks
+
+Starts TLS servers on loopback with generated certificates, plus servers
+that are slow, dead or broken. Used by test_scanner and by
+benchmarks/benchmark_scanner.py.
+"""
+import os
+import socket
+import socketserver
+import ssl
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+# Share of targets pointing at each kind of server
+DEFAULT_MIX = {
+    'healthy': 0.90,
+    'slow': 0.04,
+    'dead': 0.03,
+    'broken': 0.03,
+}
+
+
+def _name(common_name):
+    return x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+
+
+def _build_certificate(subject, issuer, public_key, signing_key, ca=False):
+    now = datetime.now(timezone.utc)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(_name(subject))
+        .issuer_name(_name(issuer))
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=90))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    if not ca:
+        builder = builder.add_extension(
+            x509.SubjectAlternativeName([x509.DNSName(subject)]), critical=False
+        )
+    return builder.sign(signing_key, hashes.SHA256())
+
+
+def generate_server_context(directory, common_name='localhost'):
+    """Return a server SSLContext with a leaf certificate and its intermediate"""
+    ca_key = ec.generate_private_key(ec.SECP256R1())
+    ca_cert = _build_certificate('Test CA', 'Test CA', ca_key.public_key(), ca_key, ca=True)
+    leaf_key = ec.generate_private_key(ec.SECP256R1())
+    leaf_cert = _build_certificate(common_name, 'Test CA', leaf_key.public_key(), ca_key)
+    
+    cert_path = os.path.join(directory, f'{common_name}.pem')
+    key_path = os.path.join(directory, f'{common_name}.key')
+    with open(cert_path, 'wb') as f:
+        f.write(leaf_cert.public_bytes(serialization.Encoding.PEM))
+        f.write(ca_cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, 'wb') as f:
+        f.write(leaf_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption()
+        ))
+    
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = 1024
+
+    def __init__(self, handler, context=None, delay=0):
+        self.context = context
+        self.delay = delay
+        super().__init__(('127.0.0.1', 0), handler)
+
+
+class _TLSHandler(socketserver.BaseRequestHandler):
+    """Completes the handshake, optionally after a delay, then hangs up"""
+
+    def handle(self):
+        if self.server.delay:
+            time.sleep(self.server.delay)
+        try:
+            with self.server.context.wrap_socket(self.request, server_side=True):
+                pass
+        except (OSError, ssl.SSLError):
+            pass
+
+
+class _BrokenHandler(socketserver.BaseRequestHandler):
+    """Answers with plain text instead of a TLS handshake"""
+
+    def handle(self):
+        try:
+            self.request.sendall(b'HTTP/1.1 400 Bad Request\r\nConnection: close\r\n\r\n')
+        except OSError:
+            pass
+
+
+def _dead_port():
+    """Return a loopback port nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class TestServers:
+    """A set of local servers of each kind, usable as a context manager
+
+    `healthy` servers complete the handshake at once, `slow` ones wait
+    `slow_delay` seconds first, `dead` ports refuse connections and
+    `broken` servers answer with plain text.
+    """
+
+    def __init__(self, healthy=10, slow=2, dead=2, broken=2, slow_delay=2.0):
+        self.counts = {'healthy': healthy, 'slow': slow, 'dead': dead, 'broken': broken}
+        self.slow_delay = slow_delay
+        self.endpoints = {kind: [] for kind in self.counts}
+        self._servers = []
+        self._directory = None
+
+    def start(self):
+        self._directory = tempfile.TemporaryDirectory()
+        context = generate_server_context(self._directory.name)
+        
+        kinds = {
+            'healthy': lambda: _Server(_TLSHandler, context),
+            'slow': lambda: _Server(_TLSHandler, context, self.slow_delay),
+            'broken': lambda: _Server(_BrokenHandler),
+        }
+        for kind, factory in kinds.items():
+            for _ in range(self.counts[kind]):
+                server = factory()
+                threading.Thread(target=server.serve_forever, daemon=True).start()
+                self._servers.append(server)
+                self.endpoints[kind].append(server.server_address[1])
+        
+        self.endpoints['dead'] = [_dead_port() for _ in range(self.counts['dead'])]
+        return self
+
+    def stop(self):
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+        self._servers = []
+        if self._directory is not None:
+            self._directory.cleanup()
+            self._directory = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def targets(self, count, mix=None):
+        """Return `count` (address, port) targets spread over the servers by mix"""
+        mix = mix or DEFAULT_MIX
+        kinds = [kind for kind in mix if self.endpoints.get(kind)]
+        total = sum(mix[kind] for kind in kinds)
+        
+        shares = {kind: int(count * mix[kind] / total) for kind in kinds}
+        shares[kinds[0]] += count - sum(shares.values())
+        
+        # Spread each kind evenly over the run so slow and failing targets
+        # do not all land in one batch
+        entries = []
+        for kind in kinds:
+            ports = self.endpoints[kind]
+            entries.extend(
+                ((i + 0.5) / shares[kind], ports[i % len(ports)]) for i in range(shares[kind])
+            )
+        entries.sort()
+        return [('127.0.0.1', port) for position, port in entries]
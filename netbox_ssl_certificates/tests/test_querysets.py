@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+from cryptography import x509
+from cryptography.x509.oid import NameOID
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from django.test import TestCase
+from dcim.models import Site
+from netbox_ssl_certificates.models import CONTENT_FIELDS, Certificate
+from netbox_ssl_certificates.notifications import get_expired_certificates, get_expiring_certificates
+from netbox_ssl_certificates.template_content import ObjectCertificates
+from netbox_ssl_certificates.views import CertificateListView
+
+# Columns that must never be loaded by list, table and panel queries
+HEAVY_FIELDS = ('certificate_file', 'certificate_der', 'private_key')
+
+
+def generate_pem(common_name, days=90):
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
+    now = datetime.now(timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=days))
+        .sign(key, hashes.SHA256())
+    )
+    return cert.public_bytes(serialization.Encoding.PEM).decode('utf-8')
+
+
+class WithoutContentTestCase(TestCase):
+    """Heavy certificate columns stay out of list and panel queries"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.site = Site.objects.create(name='Site 1', slug='site-1')
+        for i, days in enumerate((5, 60)):
+            certificate = Certificate.objects.create(
+                name=f'Certificate {i}',
+                certificate_file=generate_pem(f'host{i}.example.com', days)
+            )
+            certificate.sites.add(cls.site)
+
+    def assertContentDeferred(self, queryset):
+        deferred, defer = queryset.query.deferred_loading
+        self.assertTrue(defer)
+        for field in HEAVY_FIELDS:
+            self.assertIn(field, deferred)
+        
+        sql = str(queryset.query)
+        for field in HEAVY_FIELDS:
+            self.assertNotIn(f'"{field}"', sql)
+
+    def test_without_content(self):
+        queryset = Certificate.objects.without_content()
+        self.assertEqual(set(queryset.query.deferred_loading[0]), set(CONTENT_FIELDS))
+        self.assertContentDeferred(queryset)
+        
+        certificate = queryset.get(name='Certificate 0')
+        self.assertTrue(set(HEAVY_FIELDS) <= certificate.get_deferred_fields())
+        self.assertEqual(certificate.common_name, 'host0.example.com')
+
+    def test_list_view(self):
+        self.assertContentDeferred(CertificateListView.queryset)
+
+    def test_object_panel(self):
+        extension = ObjectCertificates({'object': self.site})
+        with mock.patch.object(ObjectCertificates, 'render', return_value='') as render:
+            extension.right_page()
+        certificates = render.call_args.kwargs['extra_context']['certificates']
+        self.assertEqual(certificates.count(), 2)
+        self.assertContentDeferred(certificates)
+
+    def test_notifications(self):
+        self.assertContentDeferred(get_expiring_certificates(30))
+        self.assertContentDeferred(get_expired_certificates())
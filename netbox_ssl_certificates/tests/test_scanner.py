@@ -0,0 +1,132 @@
+import asyncio
+from django.test import SimpleTestCase
+from netbox_ssl_certificates.scanner import (
+    EndpointRateLimits, _iter_concurrently, bulk_scan_domains, iter_sweep_network
+)
+from netbox_ssl_certificates.tests.servers import TestServers
+
+
+class IterConcurrentlyErrorTestCase(SimpleTestCase):
+    """Errors raised while iterating the input reach the caller"""
+
+    def test_items_error_is_raised(self):
+        def items():
+            yield 1
+            raise ValueError('bad item')
+        
+        async def scan(item):
+            return item
+        
+        with self.assertRaisesMessage(ValueError, 'bad item'):
+            list(_iter_concurrently(scan, items(), 4))
+
+    def test_scan_error_is_raised(self):
+        async def scan(item):
+            raise RuntimeError(f'scan {item} failed')
+        
+        with self.assertRaises(RuntimeError):
+            list(_iter_concurrently(scan, [1, 2, 3], 2))
+
+    def test_bulk_scan_bad_target(self):
+        with self.assertRaises(ValueError):
+            bulk_scan_domains(['127.0.0.1', ('127.0.0.1', 443, 'extra')], connect_timeout=0.1)
+
+    def test_sweep_invalid_network(self):
+        with self.assertRaises(ValueError):
+            list(iter_sweep_network(['10.0.0.0/33']))
+
+
+
+class IterConcurrentlyRateLimitTestCase(SimpleTestCase):
+    """Items waiting for a rate limit do not hold back other items"""
+
+    def test_throttled_address_does_not_block_others(self):
+        rate_limits = EndpointRateLimits(per_ip=5, per_subnet=0)
+        busy = [('192.0.2.1', index) for index in range(10)]
+        others = [(f'198.51.100.{index}', 0) for index in range(1, 21)]
+        
+        async def scan(item):
+            await rate_limits.acquire(item[0])
+            return item
+        
+        order = [item for item, result in _iter_concurrently(scan, busy + others, 5)]
+        
+        self.assertCountEqual(order, busy + others)
+        # Only the burst of the busy address gets through before the others
+        self.assertCountEqual(order[:25], busy[:5] + others)
+
+
+
+class IterConcurrentlyOrderTestCase(SimpleTestCase):
+    """Results are yielded as they complete, bulk results in input order"""
+
+    def test_completion_order(self):
+        async def scan(delay):
+            await asyncio.sleep(delay)
+            return delay
+        
+        delays = [0.3, 0.1, 0.2, 0]
+        results = list(_iter_concurrently(scan, delays, 4))
+        
+        self.assertEqual([item for item, result in results], sorted(delays))
+        self.assertTrue(all(item == result for item, result in results))
+
+
+class ScanTestCase(SimpleTestCase):
+    """Scans against local healthy, slow, dead and broken servers"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.servers = TestServers(healthy=2, slow=1, dead=1, broken=1, slow_delay=2).start()
+        cls.addClassCleanup(cls.servers.stop)
+
+    def scan(self, kind, **options):
+        options.setdefault('handshake_timeout', 1)
+        return bulk_scan_domains(
+            [('127.0.0.1', port) for port in self.servers.endpoints[kind]], **options
+        )
+
+    def test_healthy(self):
+        for result in self.scan('healthy'):
+            self.assertTrue(result['success'])
+            self.assertEqual(len(result['fingerprint_sha256'].split(':')), 32)
+            self.assertIn('BEGIN CERTIFICATE', result['certificate'])
+            self.assertIsNotNone(result['valid_until'])
+
+    def test_dead_is_connection_error(self):
+        for result in self.scan('dead'):
+            self.assertFalse(result['success'])
+            self.assertEqual(result['error_class'], 'connection')
+
+    def test_broken_is_not_tls(self):
+        for result in self.scan('broken'):
+            self.assertFalse(result['success'])
+            # Depends on whether the plain text arrives before the ClientHello
+            self.assertIn(result['error_class'], ('connection', 'ssl'))
+
+    def test_slow_is_timeout(self):
+        for result in self.scan('slow', handshake_timeout=0.5):
+            self.assertFalse(result['success'])
+            self.assertEqual(result['error_class'], 'timeout')
+
+    def test_unresolvable_is_dns_error(self):
+        result, = bulk_scan_domains(['unresolvable.invalid'], connect_timeout=1)
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_class'], 'dns')
+
+    def test_results_in_input_order(self):
+        endpoints = self.servers.endpoints
+        targets = [
+            ('127.0.0.1', endpoints['slow'][0]),
+            ('127.0.0.1', endpoints['healthy'][0]),
+            ('127.0.0.1', endpoints['dead'][0]),
+            ('127.0.0.1', endpoints['broken'][0]),
+            ('127.0.0.1', endpoints['healthy'][1]),
+        ]
+        results = bulk_scan_domains(targets, concurrency=5, handshake_timeout=3)
+        
+        self.assertEqual([result['port'] for result in results], [port for host, port in targets])
+        self.assertEqual(
+            [result['success'] for result in results], [True, True, False, False, True]
+        )
@@ -1,7 +1,7 @@
 from django.urls import path
 from netbox.views.generic import ObjectChangeLogView
 from . import views
-from .models import Certificate
+from .models import Certificate, ScanTarget
 
 urlpatterns = [
     # Dashboard
@@ -16,12 +16,23 @@ urlpatterns = [
     path('certificates/<int:pk>/changelog/', ObjectChangeLogView.as_view(), name='certificate_changelog', kwargs={'model': Certificate}),
     path('certificates/delete/', views.CertificateBulkDeleteView.as_view(), name='certificate_bulk_delete'),
     
+    # Scan targets
+    path('scan-targets/', views.ScanTargetListView.as_view(), name='scantarget_list'),
+    path('scan-targets/add/', views.ScanTargetEditView.as_view(), name='scantarget_add'),
+    path('scan-targets/<int:pk>/', views.ScanTargetView.as_view(), name='scantarget'),
+    path('scan-targets/<int:pk>/edit/', views.ScanTargetEditView.as_view(), name='scantarget_edit'),
+    path('scan-targets/<int:pk>/delete/', views.ScanTargetDeleteView.as_view(), name='scantarget_delete'),
+    path('scan-targets/<int:pk>/changelog/', ObjectChangeLogView.as_view(), name='scantarget_changelog', kwargs={'model': ScanTarget}),
+    path('scan-targets/delete/', views.ScanTargetBulkDeleteView.as_view(), name='scantarget_bulk_delete'),
+    
     # Import & Export
     path('import/', views.CertificateImportView.as_view(), name='certificate_import'),
     path('certificates/<int:pk>/export/', views.CertificateExportView.as_view(), name='certificate_export'),
     
     # Scan
     path('scan/', views.CertificateScanView.as_view(), name='certificate_scan'),
+    path('scan/bulk/', views.CertificateBulkScanView.as_view(), name='certificate_bulk_scan'),
+    path('scan/jobs/<int:pk>/', views.CertificateScanJobView.as_view(), name='certificate_scan_job'),
     
     # Chain verification
     path('certificates/<int:pk>/verify-chain/', views.CertificateVerifyChainView.as_view(), name='certificate_verify_chain'),
@@ -0,0 +1,247 @@
+"""Certificate helpers that do not depend on Django
+
+Kept free of Django imports so they can run in worker processes.
+"""
+import hashlib
+import ipaddress
+import re
+import threading
+from collections import OrderedDict
+from cryptography import x509
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, serialization
+
+# Default number of parsed certificates kept in memory
+CERTIFICATE_CACHE_SIZE = 1024
+
+# Longest name kept in the CertificateName index
+MAX_HOSTNAME_LENGTH = 255
+
+# A DNS name, optionally with a leading wildcard label
+HOSTNAME_RE = re.compile(r'^(\*\.)?([a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?\.)*[a-z0-9_]([a-z0-9_-]{0,61}[a-z0-9_])?$')
+
+
+def percentile(sorted_values, pct):
+    """Return the nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, int(round(pct / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def format_fingerprint(digest):
+    """Format a binary digest as colon-separated uppercase hex"""
+    return ':'.join(format(b, '02X') for b in digest)
+
+
+class CertificateCache:
+    """Bounded LRU cache of parsed certificates and their metadata
+
+    Entries are keyed by the SHA-256 of the encoded (PEM or DER) bytes, so
+    the same certificate is parsed once however often it is loaded. Hit
+    and miss counters are kept to size the cache. Safe to share between
+    threads.
+    """
+    
+    def __init__(self, maxsize=CERTIFICATE_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return entry
+    
+    def _put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def _entry(self, data, loader):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        key = hashlib.sha256(data).digest()
+        entry = self._get(key)
+        if entry is None:
+            # [certificate, metadata]; metadata is derived on first use
+            entry = [loader(data, default_backend()), None]
+            self._put(key, entry)
+        return entry
+    
+    def load_pem(self, pem):
+        """Return the parsed certificate for PEM text or bytes"""
+        return self._entry(pem, x509.load_pem_x509_certificate)[0]
+    
+    def load_der(self, der):
+        """Return the parsed certificate for DER bytes"""
+        return self._entry(der, x509.load_der_x509_certificate)[0]
+    
+    def add(self, data, cert):
+        """Cache an already parsed certificate under another encoding of it"""
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self._put(hashlib.sha256(data).digest(), [cert, None])
+    
+    def metadata(self, data, der=False):
+        """Return certificate_metadata() for PEM text or DER bytes, computed once per entry"""
+        loader = x509.load_der_x509_certificate if der else x509.load_pem_x509_certificate
+        entry = self._entry(data, loader)
+        if entry[1] is None:
+            entry[1] = certificate_metadata(entry[0])
+        metadata = dict(entry[1])
+        metadata['subject_alternative_names'] = list(metadata['subject_alternative_names'])
+        return metadata
+    
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+    
+    def stats(self):
+        """Return entry count, hit and miss counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared by the models, scanner, forms and views of this process
+certificate_cache = CertificateCache()
+
+
+def certificate_metadata(cert):
+    """Return the metadata of a parsed certificate as a dict
+
+    The keys match the Certificate fields derived from the PEM.
+    """
+    # Extract common name
+    try:
+        common_name = cert.subject.get_attributes_for_oid(
+            x509.oid.NameOID.COMMON_NAME
+        )[0].value
+    except (IndexError, AttributeError):
+        common_name = 'N/A'
+    
+    # Extract issuer
+    try:
+        issuer = cert.issuer.get_attributes_for_oid(
+            x509.oid.NameOID.COMMON_NAME
+        )[0].value
+    except (IndexError, AttributeError):
+        issuer = 'N/A'
+    
+    # Extract SANs
+    try:
+        san_ext = cert.extensions.get_extension_for_oid(
+            x509.oid.ExtensionOID.SUBJECT_ALTERNATIVE_NAME
+        )
+        subject_alternative_names = [str(name.value) for name in san_ext.value]
+    except x509.ExtensionNotFound:
+        subject_alternative_names = []
+    
+    return {
+        'common_name': common_name,
+        'issuer': issuer,
+        'subject_alternative_names': subject_alternative_names,
+        'serial_number': format(cert.serial_number, 'X'),
+        'valid_from': cert.not_valid_before_utc,
+        'valid_until': cert.not_valid_after_utc,
+        'fingerprint_sha256': format_fingerprint(cert.fingerprint(hashes.SHA256())),
+        'is_self_signed': cert.issuer == cert.subject,
+        'key_size': cert.public_key().key_size,
+        'algorithm': cert.signature_algorithm_oid._name,
+    }
+
+
+def parse_certificate_metadata(certificate_file, der=False):
+    """Parse a PEM (or, with der=True, DER) certificate and return its metadata
+
+    Raises ValueError if the certificate cannot be parsed.
+    """
+    try:
+        return certificate_cache.metadata(certificate_file, der)
+    except Exception as e:
+        raise ValueError(f'Failed to parse certificate: {str(e)}')
+
+
+def parse_certificate_metadata_or_none(certificate_file, der=False):
+    """Like parse_certificate_metadata(), but return None for an invalid certificate"""
+    try:
+        return parse_certificate_metadata(certificate_file, der)
+    except ValueError:
+        return None
+
+
+def pem_to_der(certificate_file):
+    """Return the DER bytes of a PEM certificate"""
+    cert = certificate_cache.load_pem(certificate_file)
+    der = cert.public_bytes(serialization.Encoding.DER)
+    certificate_cache.add(der, cert)
+    return der
+
+
+def reverse_hostname(name):
+    """Return a hostname with its labels reversed (api.example.com -> com.example.api)"""
+    return '.'.join(reversed(name.split('.')))
+
+
+def normalize_hostname(name):
+    """Lower-case a hostname and drop surrounding whitespace and a trailing dot"""
+    return name.strip().rstrip('.').lower()
+
+
+def is_indexable_name(name):
+    """Whether a normalized CN or SAN is a DNS name (optionally wildcard) or an IP
+
+    URIs, e-mail addresses, directory names and anything longer than
+    MAX_HOSTNAME_LENGTH are not hostnames and are left out of the index.
+    """
+    if not name or len(name) > MAX_HOSTNAME_LENGTH:
+        return False
+    try:
+        ipaddress.ip_address(name)
+        return True
+    except ValueError:
+        pass
+    return HOSTNAME_RE.match(name) is not None
+
+
+def certificate_names(common_name, subject_alternative_names):
+    """Return the (name, source) pairs a certificate is issued for
+
+    Names are normalized and de-duplicated, SANs first. Only DNS names and
+    IP addresses are returned (see is_indexable_name()), so a common name
+    of 'N/A' (no CN in the subject) is skipped as well.
+    """
+    names = {}
+    for san in subject_alternative_names or []:
+        name = normalize_hostname(str(san))
+        if is_indexable_name(name):
+            names.setdefault(name, 'san')
+    if common_name:
+        name = normalize_hostname(common_name)
+        if is_indexable_name(name):
+            names.setdefault(name, 'cn')
+    return list(names.items())
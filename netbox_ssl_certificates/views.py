@@ -4,9 +4,12 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib import messages
 from django.views.generic import TemplateView, FormView, View
-from django.http import HttpResponse
+from django.http import HttpResponse, JsonResponse
+from django.urls import reverse
+from core.choices import JobStatusChoices
+from core.models import Job
 from . import filtersets, forms, models, tables
-from .scanner import auto_import_from_domain, scan_domain
+from .jobs import CertificateBulkScanJob, CertificateScanJob
 import zipfile
 import io
 
@@ -19,40 +22,8 @@ class CertificateDashboardView(LoginRequiredMixin, TemplateView):
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Общая статистика
-        total = models.Certificate.objects.count()
-        expired = models.Certificate.objects.filter(is_expired=True).count()
-        
-        # Правильный фильтр для expiring_soon
-        expiring_soon = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=30,
-            days_until_expiry__gte=0
-        ).count()
-        
-        valid = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__gt=30
-        ).count()
-        
-        # Статистика по срокам истечения
-        expiring_7_days = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=7,
-            days_until_expiry__gte=0
-        ).count()
-        
-        expiring_30_days = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=30,
-            days_until_expiry__gt=7
-        ).count()
-        
-        expiring_90_days = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=90,
-            days_until_expiry__gt=30
-        ).count()
+        # Общая статистика и статистика по срокам истечения одним запросом
+        summary = models.Certificate.objects.expiry_summary()
         
         # Self-signed сертификаты
         self_signed = models.Certificate.objects.filter(is_self_signed=True).count()
@@ -64,27 +35,15 @@ class CertificateDashboardView(LoginRequiredMixin, TemplateView):
             ca_certificate__isnull=True
         ).count()
         
-        # Списки сертификатов с правильными фильтрами
-        expiring_certificates = models.Certificate.objects.filter(
-            is_expired=False,
-            days_until_expiry__lte=30,
-            days_until_expiry__gte=0
-        ).order_by('valid_until')[:10]
+        # Списки сертификатов
+        expiring_certificates = models.Certificate.objects.without_content().expiring_within().order_by('valid_until')[:10]
         
-        recently_expired = models.Certificate.objects.filter(
-            is_expired=True
-        ).order_by('-valid_until')[:10]
+        recently_expired = models.Certificate.objects.without_content().expired().order_by('-valid_until')[:10]
         
-        recently_added = models.Certificate.objects.order_by('-created')[:10]
+        recently_added = models.Certificate.objects.without_content().order_by('-created')[:10]
         
+        context.update(summary)
         context.update({
-            'total': total,
-            'expired': expired,
-            'expiring_soon': expiring_soon,
-            'valid': valid,
-            'expiring_7_days': expiring_7_days,
-            'expiring_30_days': expiring_30_days,
-            'expiring_90_days': expiring_90_days,
             'self_signed': self_signed,
             'chain_verified': chain_verified,
             'expiring_certificates': expiring_certificates,
@@ -98,7 +57,7 @@ class CertificateDashboardView(LoginRequiredMixin, TemplateView):
 class CertificateListView(generic.ObjectListView):
     """List view for certificates"""
     
-    queryset = models.Certificate.objects.all()
+    queryset = models.Certificate.objects.without_content().with_expiry()
     table = tables.CertificateTable
     filterset = filtersets.CertificateFilterSet
     filterset_form = forms.CertificateFilterForm
@@ -129,6 +88,46 @@ class CertificateBulkDeleteView(generic.BulkDeleteView):
     table = tables.CertificateTable
 
 
+class ScanTargetListView(generic.ObjectListView):
+    """List view for scan targets"""
+    queryset = models.ScanTarget.objects.select_related(
+        'certificate', 'device', 'virtual_machine'
+    )
+    table = tables.ScanTargetTable
+    filterset = filtersets.ScanTargetFilterSet
+    filterset_form = forms.ScanTargetFilterForm
+
+
+class ScanTargetView(generic.ObjectView):
+    """Detail view for scan target"""
+    queryset = models.ScanTarget.objects.all()
+
+    # Number of history rows shown on the detail page
+    history_length = 20
+
+    def get_extra_context(self, request, instance):
+        return {
+            'scan_history': instance.scan_results.all()[:self.history_length],
+        }
+
+
+class ScanTargetEditView(generic.ObjectEditView):
+    """Edit view for scan target"""
+    queryset = models.ScanTarget.objects.all()
+    form = forms.ScanTargetForm
+
+
+class ScanTargetDeleteView(generic.ObjectDeleteView):
+    """Delete view for scan target"""
+    queryset = models.ScanTarget.objects.all()
+
+
+class ScanTargetBulkDeleteView(generic.BulkDeleteView):
+    """Bulk delete view for scan targets"""
+    queryset = models.ScanTarget.objects.all()
+    table = tables.ScanTargetTable
+
+
 class CertificateImportView(LoginRequiredMixin, FormView):
     """View for importing certificates from files"""
     
@@ -205,46 +204,117 @@ class CertificateScanView(LoginRequiredMixin, FormView):
     form_class = forms.CertificateScanForm
     
     def form_valid(self, form):
-        hostname = form.cleaned_data['hostname']
-        port = form.cleaned_data['port']
-        name = form.cleaned_data.get('name')
-        update_existing = form.cleaned_data['update_existing']
         device = form.cleaned_data.get('assign_to_device')
         
-        try:
-            # Scan and import
-            certificate, message = auto_import_from_domain(
-                hostname,
-                port,
-                name,
-                update_existing
-            )
-            
-            if certificate:
-                # Assign to device if specified
-                if device:
-                    certificate.devices.add(device)
-                    certificate.save()
-                
-                messages.success(
-                    self.request,
-                    f'{message}: {certificate.name}'
-                )
-                
-                return redirect('plugins:netbox_ssl_certificates:certificate', pk=certificate.pk)
-            else:
-                messages.error(
-                    self.request,
-                    f'Scan failed: {message}'
-                )
-                return self.form_invalid(form)
+        # Scanning can take up to the full timeout; run it as a background
+        # job so the request returns immediately
+        job = CertificateScanJob.enqueue(
+            user=self.request.user,
+            hostname=form.cleaned_data['hostname'],
+            port=form.cleaned_data['port'],
+            name=form.cleaned_data.get('name') or None,
+            update_existing=form.cleaned_data['update_existing'],
+            device_id=device.pk if device else None,
+        )
         
-        except Exception as e:
-            messages.error(
-                self.request,
-                f'Scan failed: {str(e)}'
+        messages.info(
+            self.request,
+            f'Scan of {form.cleaned_data["hostname"]}:{form.cleaned_data["port"]} queued'
+        )
+        
+        return redirect('plugins:netbox_ssl_certificates:certificate_scan_job', pk=job.pk)
+
+
+class CertificateBulkScanView(LoginRequiredMixin, FormView):
+    """View for scanning a list of targets in one background job"""
+    
+    template_name = 'netbox_ssl_certificates/certificate_bulk_scan.html'
+    form_class = forms.CertificateBulkScanForm
+    
+    def form_valid(self, form):
+        targets = form.cleaned_data['parsed_targets']
+        
+        job = CertificateBulkScanJob.enqueue(
+            user=self.request.user,
+            targets=[list(target) for target in targets],
+            update_existing=form.cleaned_data['update_existing'],
+            concurrency=form.cleaned_data.get('concurrency'),
+        )
+        
+        messages.info(self.request, f'Bulk scan of {len(targets)} targets queued')
+        
+        return redirect('plugins:netbox_ssl_certificates:certificate_scan_job', pk=job.pk)
+
+
+class CertificateScanJobView(LoginRequiredMixin, View):
+    """Status page for a background scan job
+
+    Returns JSON when polled with ?format=json; the page polls itself.
+    Single scans redirect to the certificate once the job has finished;
+    bulk scans show live progress and fetch new per-target results with
+    ?since=<number of results already shown>.
+    """
+    
+    template_name = 'netbox_ssl_certificates/certificate_scan_job.html'
+    bulk_template_name = 'netbox_ssl_certificates/certificate_bulk_scan_job.html'
+    
+    def get(self, request, pk):
+        jobs = Job.objects.all()
+        if not request.user.is_superuser:
+            jobs = jobs.filter(user=request.user)
+        job = get_object_or_404(jobs, pk=pk)
+        
+        data = job.data or {}
+        if job.name == CertificateBulkScanJob.name:
+            return self.get_bulk(request, job, data)
+        
+        finished = job.status in JobStatusChoices.TERMINAL_STATE_CHOICES
+        certificate_url = None
+        if data.get('certificate_id'):
+            certificate_url = reverse(
+                'plugins:netbox_ssl_certificates:certificate',
+                args=[data['certificate_id']]
             )
-            return self.form_invalid(form)
+        
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'status': job.status,
+                'finished': finished,
+                'success': bool(data.get('success')),
+                'message': data.get('message') or job.error,
+                'certificate_url': certificate_url,
+            })
+        
+        return render(request, self.template_name, {
+            'job': job,
+            'data': data,
+            'finished': finished,
+            'certificate_url': certificate_url,
+        })
+    
+    def get_bulk(self, request, job, data):
+        finished = job.status in JobStatusChoices.TERMINAL_STATE_CHOICES
+        
+        if request.GET.get('format') == 'json':
+            try:
+                since = max(0, int(request.GET.get('since', 0)))
+            except ValueError:
+                since = 0
+            return JsonResponse({
+                'status': job.status,
+                'finished': finished,
+                'error': job.error,
+                'total': data.get('total', 0),
+                'done': data.get('done', 0),
+                'counts': data.get('counts', {}),
+                'results': data.get('results', [])[since:],
+            })
+        
+        return render(request, self.bulk_template_name, {
+            'job': job,
+            'data': data,
+            'finished': finished,
+        })
 
 
 class CertificateExportView(LoginRequiredMixin, View):